@@ -1,7 +1,83 @@
 from django.contrib import admin
+from django.contrib.auth.admin import UserAdmin
+from django.db.models import CASCADE
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 
 from .constants import SHORT_STANDARD, SHORT_STANDARD_MIN
-from .models import Category, Location, Post
+from .deletion import soft_delete_post, soft_delete_user
+from .export import EXPORT_FORMATS
+from .models import Category, Comment, Location, Post, User
+
+
+def streaming_export(queryset, export_format):
+    """Отдаёт выбранные записи файлом, формируя его по мере чтения."""
+    render, content_type = EXPORT_FORMATS[export_format]
+    response = StreamingHttpResponse(
+        render(queryset), content_type=f'{content_type}; charset=utf-8'
+    )
+    filename = (
+        f'{queryset.model._meta.model_name}-'
+        f'{timezone.now():%Y%m%d-%H%M%S}.{export_format}'
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+@admin.action(description='Выгрузить выбранные в JSONL')
+def export_jsonl(modeladmin, request, queryset):
+    return streaming_export(queryset, 'jsonl')
+
+
+@admin.action(description='Выгрузить выбранные в CSV')
+def export_csv(modeladmin, request, queryset):
+    return streaming_export(queryset, 'csv')
+
+
+def cascade_models(model, found=None):
+    """Модели, строки которых удалит каскад от model, — без чтения строк."""
+    found = set() if found is None else found
+    for relation in model._meta.related_objects:
+        related = relation.related_model
+        if relation.on_delete is CASCADE and related not in found:
+            found.add(related)
+            cascade_models(related, found)
+    return found
+
+
+class SoftDeleteAdminMixin:
+    """
+    Удаление из админки скрывает объект сразу, а зависимые строки
+    удаляет фоновая задача пачками. Страница подтверждения не
+    обходит каскад, чтобы не загружать тысячи комментариев, но права
+    на удаление зависимых моделей проверяются, как у Django.
+    """
+
+    soft_delete = None
+
+    def delete_model(self, request, obj):
+        self.soft_delete(obj)
+
+    def delete_queryset(self, request, queryset):
+        for obj in queryset:
+            self.soft_delete(obj)
+
+    def get_deleted_objects(self, objs, request):
+        objs = list(objs)
+        perms_needed = {
+            model._meta.verbose_name
+            for model in {self.model, *cascade_models(self.model)}
+            if model in self.admin_site._registry
+            and not self.admin_site._registry[model].has_delete_permission(
+                request
+            )
+        }
+        return (
+            [str(obj) for obj in objs],
+            {self.model._meta.verbose_name_plural: len(objs)},
+            perms_needed,
+            [],
+        )
 
 
 @admin.register(Location)
@@ -36,7 +112,9 @@ class CategoryAdmin(admin.ModelAdmin):
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(SoftDeleteAdminMixin, admin.ModelAdmin):
+    soft_delete = staticmethod(soft_delete_post)
+
     list_display = (
         'short_title',
         'short_text',
@@ -61,6 +139,10 @@ class PostAdmin(admin.ModelAdmin):
     ordering = (
         '-pub_date',
     )
+    actions = (
+        export_jsonl,
+        export_csv,
+    )
 
     @admin.display(description='Заголовок')
     def short_title(self, obj):
@@ -77,3 +159,37 @@ class PostAdmin(admin.ModelAdmin):
     @admin.display(description='Категория')
     def short_category(self, obj):
         return obj.category.title[:SHORT_STANDARD]
+
+
+@admin.register(Comment)
+class CommentAdmin(admin.ModelAdmin):
+    list_display = (
+        'short_text',
+        'post',
+        'author',
+        'created_at',
+    )
+    list_select_related = (
+        'post',
+        'author',
+    )
+    raw_id_fields = (
+        'post',
+        'author',
+    )
+    actions = (
+        export_jsonl,
+        export_csv,
+    )
+
+    @admin.display(description='Текст')
+    def short_text(self, obj):
+        return obj.text[:SHORT_STANDARD]
+
+
+admin.site.unregister(User)
+
+
+@admin.register(User)
+class BlogUserAdmin(SoftDeleteAdminMixin, UserAdmin):
+    soft_delete = staticmethod(soft_delete_user)
@@ -0,0 +1,196 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.urls import reverse
+
+from blog.cache import get_cache
+from blog.constants import (AUTOCOMPLETE_CACHE_SIZE, AUTOCOMPLETE_KEY_LENGTH,
+                            AUTOCOMPLETE_LIMIT, AUTOCOMPLETE_MAX_WORDS,
+                            AUTOCOMPLETE_MIN_PREFIX)
+from blog.models import (AutocompleteEntry, Category, Post, User,
+                         publication_now)
+
+AUTOCOMPLETE_VERSION_KEY = 'blog:autocomplete:version'
+WORD_START = re.compile(r'(?<!\w)\w')
+SPACES = re.compile(r'\s+')
+REBUILD_BATCH_SIZE = 2000
+URL_NAMES = {
+    AutocompleteEntry.POST: 'blog:post_detail',
+    AutocompleteEntry.CATEGORY: 'blog:category_posts',
+    AutocompleteEntry.USER: 'blog:profile',
+}
+
+
+def normalize(text):
+    return SPACES.sub(' ', text).strip().lower()
+
+
+def entry_keys(label):
+    """Ключи для каждого начала слова: «Мой пост» → «мой пост», «пост»."""
+    text = normalize(label)
+    keys = []
+    for match in WORD_START.finditer(text):
+        keys.append(text[match.start():][:AUTOCOMPLETE_KEY_LENGTH])
+        if len(keys) == AUTOCOMPLETE_MAX_WORDS:
+            break
+    return list(dict.fromkeys(keys))
+
+
+def source_of(instance):
+    """Поля подсказки объекта, кроме ключа."""
+    if isinstance(instance, Post):
+        return {
+            'kind': AutocompleteEntry.POST, 'label': instance.title,
+            'target': str(instance.pk), 'post': instance,
+            'category_id': instance.category_id,
+            'is_published': (
+                instance.is_published and not instance.is_deleted
+            ),
+            'pub_date': instance.pub_date,
+        }
+    if isinstance(instance, Category):
+        return {
+            'kind': AutocompleteEntry.CATEGORY, 'label': instance.title,
+            'target': instance.slug, 'category': instance,
+            'is_published': True,
+        }
+    return {
+        'kind': AutocompleteEntry.USER, 'label': instance.username,
+        'target': instance.username, 'user': instance,
+        'is_published': instance.is_active,
+    }
+
+
+def make_entries(instance):
+    fields = source_of(instance)
+    return [
+        AutocompleteEntry(key=key, **fields)
+        for key in entry_keys(fields['label'])
+    ]
+
+
+def refresh_entries(instance):
+    """Пересобирает подсказки одного объекта после его сохранения."""
+    kind = source_of(instance)['kind']
+    AutocompleteEntry.objects.filter(**{kind: instance}).delete()
+    AutocompleteEntry.objects.bulk_create(make_entries(instance))
+    bump_autocomplete_version()
+
+
+def rebuild_entries():
+    """Полная пересборка индекса пачками; возвращает число строк."""
+    AutocompleteEntry.objects.all().delete()
+    total = 0
+    sources = (
+        Post.objects.only(
+            'id', 'title', 'category_id', 'is_published', 'is_deleted',
+            'pub_date'),
+        Category.objects.only('id', 'title', 'slug'),
+        User.objects.only('id', 'username', 'is_active'),
+    )
+    for queryset in sources:
+        batch = []
+        for instance in queryset.iterator(chunk_size=REBUILD_BATCH_SIZE):
+            batch.extend(make_entries(instance))
+            if len(batch) >= REBUILD_BATCH_SIZE:
+                AutocompleteEntry.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+        AutocompleteEntry.objects.bulk_create(batch)
+        total += len(batch)
+    bump_autocomplete_version()
+    return total
+
+
+def get_autocomplete_version():
+    version = get_cache().get(AUTOCOMPLETE_VERSION_KEY)
+    if version is None:
+        version = bump_autocomplete_version()
+    return version
+
+
+def bump_autocomplete_version():
+    """Сбрасывает LRU подсказок во всех процессах: как у кеша страниц."""
+    version = time.time_ns()
+    get_cache().set(AUTOCOMPLETE_VERSION_KEY, version, None)
+    return version
+
+
+class PrefixCache:
+    """Потокобезопасный LRU: ключ → результат, вытесняет самые старые."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.items:
+                return None
+            self.items.move_to_end(key)
+            return self.items[key]
+
+    def set(self, key, value):
+        with self.lock:
+            self.items[key] = value
+            self.items.move_to_end(key)
+            while len(self.items) > self.maxsize:
+                self.items.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+
+
+prefix_cache = PrefixCache(AUTOCOMPLETE_CACHE_SIZE)
+
+
+def prefix_upper_bound(prefix):
+    """Первая строка после всех строк с этим префиксом."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def suggest(text, limit=AUTOCOMPLETE_LIMIT):
+    """
+    До limit подсказок по началу слова. Результат зависит только от
+    префикса, поколения индекса и часов публикации, поэтому он общий
+    для всех пользователей и живёт в LRU.
+    """
+    prefix = normalize(text)[:AUTOCOMPLETE_KEY_LENGTH]
+    if len(prefix) < AUTOCOMPLETE_MIN_PREFIX:
+        return []
+    now = publication_now()
+    cache_key = (get_autocomplete_version(), now, prefix, limit)
+    results = prefix_cache.get(cache_key)
+    if results is None:
+        results = lookup(prefix, now, limit)
+        prefix_cache.set(cache_key, results)
+    return results
+
+
+def lookup(prefix, now, limit):
+    rows = AutocompleteEntry.objects.filter(
+        Q(kind=AutocompleteEntry.POST, pub_date__lt=now,
+          category__is_published=True)
+        | Q(kind=AutocompleteEntry.CATEGORY, category__is_published=True)
+        | Q(kind=AutocompleteEntry.USER),
+        is_published=True,
+        key__gte=prefix,
+        key__lt=prefix_upper_bound(prefix),
+    ).order_by('key', 'id').values_list('kind', 'label', 'target')
+    results = []
+    seen = set()
+    # У объекта может быть несколько подходящих ключей: берём с запасом.
+    for kind, label, target in rows[:limit * AUTOCOMPLETE_MAX_WORDS]:
+        if (kind, target) in seen:
+            continue
+        seen.add((kind, target))
+        url = reverse(URL_NAMES[kind], args=(target,))
+        results.append({'kind': kind, 'label': label, 'url': url})
+        if len(results) == limit:
+            break
+    return results
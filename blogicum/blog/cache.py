@@ -0,0 +1,71 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from blog.models import Post, PostQuerySet
+
+PAGE_CACHE_VERSION_KEY = 'blog:page-cache:version'
+PAGE_CACHE_PARAMS = ('page', 'cursor')
+
+
+def get_cache():
+    return caches[settings.BLOG_PAGE_CACHE_ALIAS]
+
+
+def get_page_cache_version():
+    """Текущее поколение кеша страниц; меняется при любой правке данных."""
+    version = get_cache().get(PAGE_CACHE_VERSION_KEY)
+    if version is None:
+        version = bump_page_cache_version()
+    return version
+
+
+def bump_page_cache_version():
+    """
+    Инвалидирует все закешированные страницы разом.
+    Новое значение берётся из часов, а не через incr(),
+    чтобы после перезапуска файлового кеша ключи не совпали со старыми.
+    """
+    version = time.time_ns()
+    get_cache().set(PAGE_CACHE_VERSION_KEY, version, None)
+    return version
+
+
+def is_cacheable(request):
+    return request.method == 'GET' and not request.user.is_authenticated
+
+
+def make_page_cache_key(request):
+    """Ключ страницы: путь и параметры пагинации, без прочего query."""
+    params = '&'.join(
+        f'{name}={request.GET.get(name, "")}' for name in PAGE_CACHE_PARAMS
+    )
+    digest = hashlib.md5(
+        f'{request.path}?{params}'.encode()
+    ).hexdigest()
+    return f'blog:page:{get_page_cache_version()}:{digest}'
+
+
+def get_page_cache_timeout():
+    """
+    Время жизни страницы: не дольше BLOG_PAGE_CACHE_TIMEOUT
+    и не дольше момента выхода ближайшей отложенной публикации.
+    """
+    timeout = settings.BLOG_PAGE_CACHE_TIMEOUT
+    next_at = PostQuerySet.next_publication_at(Post.objects)
+    if next_at is not None:
+        seconds = (next_at - timezone.now()).total_seconds()
+        timeout = max(0, min(timeout, int(seconds) + 1))
+    return timeout
+
+
+def store_page(key, response):
+    """Сохраняет отрендеренную страницу, если она не ставит cookie."""
+    if response.cookies:
+        return
+    timeout = get_page_cache_timeout()
+    if timeout:
+        get_cache().set(key, response, timeout)
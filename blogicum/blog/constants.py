@@ -3,3 +3,27 @@ NUMBER_OF_POSTS = 5
 SHORT_STANDARD = 50
 SHORT_STANDARD_MIN = 25
 PAGINATE_BY = 10
+COMMENTS_PAGINATE_BY = 50
+COMMENT_RECOUNT_CHUNK_SIZE = 1000
+EXPORT_CHUNK_SIZE = 2000
+IMPORT_BATCH_SIZE = 2000
+SEED_BATCH_SIZE = 5000
+SEED_TEXT_POOL_SIZE = 500
+SEED_FUTURE_POSTS_SHARE = 0.05
+SEED_UNPUBLISHED_SHARE = 0.03
+SEED_POSTS_PERIOD_DAYS = 365 * 3
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MIN_PREFIX = 2
+AUTOCOMPLETE_KEY_LENGTH = 64
+AUTOCOMPLETE_MAX_WORDS = 8
+AUTOCOMPLETE_CACHE_SIZE = 1024
+EXCERPT_WORDS = 10
+READING_WORDS_PER_MINUTE = 200
+EXCERPT_BACKFILL_CHUNK_SIZE = 1000
+IMAGE_VARIANT_WIDTHS = (320, 640, 1280)
+IMAGE_WEBP_QUALITY = 80
+IMAGE_BACKFILL_BATCH_SIZE = 100
+DELETE_BATCH_SIZE = 500
+PROFILE_FIELDS = (
+    'username', 'first_name', 'last_name', 'is_staff', 'date_joined',
+)
@@ -0,0 +1,159 @@
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from blog import autocomplete
+from blog.cache import bump_page_cache_version
+from blog.constants import DELETE_BATCH_SIZE
+from blog.models import AutocompleteEntry, Comment, Post, User, UserDeletion
+from core.jobs import enqueue, job
+
+
+def delete_in_batches(queryset, batch_size=DELETE_BATCH_SIZE, raw=False):
+    """
+    Удаляет строки queryset пачками: каждая пачка — своя короткая
+    транзакция, и SQLite не блокируется на всё удаление сразу.
+    raw=True удаляет без сигналов и каскада — для строк без зависимых.
+    """
+    model = queryset.model
+    total = 0
+    while True:
+        with transaction.atomic(using=queryset.db):
+            ids = list(queryset.values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                return total
+            batch = model._base_manager.using(queryset.db).filter(
+                pk__in=ids
+            )
+            if raw:
+                batch._raw_delete(batch.db)
+            else:
+                batch.delete()
+        total += len(ids)
+
+
+@job
+def purge_post(post_id):
+    """Фоновая часть удаления поста: комментарии пачками, затем пост."""
+    if not Post._base_manager.filter(pk=post_id, is_deleted=True).exists():
+        return
+    # Сигналы комментария пересчитали бы счётчик и кеш поста,
+    # который уже скрыт и сейчас исчезнет, — пропускаем их.
+    delete_in_batches(
+        Comment._base_manager.filter(post_id=post_id), raw=True
+    )
+    Post._base_manager.filter(pk=post_id, is_deleted=True).delete()
+
+
+def deletion_requested(user_id):
+    """Удаление не отменено: запрос есть, учётная запись выключена."""
+    return UserDeletion.objects.filter(
+        user_id=user_id, user__is_active=False
+    ).exists()
+
+
+@job
+def purge_user(user_id):
+    """
+    Фоновая часть удаления пользователя: его посты, его комментарии
+    к чужим постам (уже скрытые и вычтенные из счётчиков), затем сам
+    пользователь. Если учётную запись снова включили, удаление
+    отменено и ничего не трогается. Повторный запуск безопасен.
+    """
+    if not deletion_requested(user_id):
+        return
+    post_ids = list(
+        Post._base_manager.filter(author_id=user_id, is_deleted=True)
+        .values_list('pk', flat=True)
+    )
+    for post_id in post_ids:
+        # Учётную запись могут включить, пока идёт удаление.
+        if not deletion_requested(user_id):
+            return
+        purge_post(post_id)
+    delete_in_batches(
+        Comment._base_manager.filter(author_id=user_id, is_deleted=True),
+        raw=True,
+    )
+    User.objects.filter(
+        pk=user_id, is_active=False, deletion__isnull=False
+    ).delete()
+
+
+def soft_delete_post(post):
+    """Скрывает пост одним UPDATE; тяжёлое удаление уходит в очередь."""
+    with transaction.atomic():
+        post.is_deleted = True
+        post.save(update_fields=('is_deleted', 'updated_at'))
+        autocomplete.refresh_entries(post)
+        enqueue(purge_post, post.pk)
+
+
+def set_comments_hidden(user, hidden):
+    """
+    Скрывает комментарии user (или возвращает их) и сразу поправляет
+    comment_count постов, где они оставлены.
+    """
+    comments = Comment._base_manager.filter(author=user, is_deleted=not hidden)
+    per_post = Subquery(
+        comments.filter(post=OuterRef('pk')).order_by()
+        .values('post').annotate(total=Count('pk')).values('total')
+    )
+    Post._base_manager.filter(
+        pk__in=comments.values('post_id')
+    ).update(
+        comment_count=(
+            Greatest(F('comment_count') - per_post, Value(0))
+            if hidden else F('comment_count') + per_post
+        ),
+        updated_at=timezone.now(),
+    )
+    comments.update(is_deleted=hidden)
+
+
+def soft_delete_user(user):
+    """
+    Выключает учётную запись, записывает запрос на удаление и скрывает
+    её посты и комментарии сразу; удаляет их purge_user в фоне.
+    Просто выключенная учётная запись (блокировка) не удаляется.
+    """
+    with transaction.atomic():
+        request, _ = UserDeletion.objects.get_or_create(user=user)
+        user.is_active = False
+        user.save(update_fields=('is_active',))
+        # Посты, удалённые автором раньше, не помечаются: после
+        # отмены удаления учётной записи они останутся удалёнными.
+        Post.objects.filter(author=user).update(
+            is_deleted=True, hidden_by_deletion=request,
+            updated_at=timezone.now(),
+        )
+        set_comments_hidden(user, True)
+        AutocompleteEntry.objects.filter(post__author=user).update(
+            is_published=False
+        )
+        autocomplete.refresh_entries(user)
+        enqueue(purge_user, user.pk)
+    bump_page_cache_version()
+
+
+def restore_user(user):
+    """
+    Отменяет удаление включённой снова учётной записи: посты, скрытые
+    вместе с ней, и комментарии возвращаются; посты, удалённые автором
+    отдельно, нет. Без запроса на удаление ничего не делает.
+    """
+    with transaction.atomic():
+        request = UserDeletion.objects.filter(user=user).first()
+        if request is None:
+            return
+        Post._base_manager.filter(hidden_by_deletion=request).update(
+            is_deleted=False, hidden_by_deletion=None,
+            updated_at=timezone.now(),
+        )
+        request.delete()
+        set_comments_hidden(user, False)
+        AutocompleteEntry.objects.filter(
+            post__author=user, post__is_published=True
+        ).update(is_published=True)
+    bump_page_cache_version()
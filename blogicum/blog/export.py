@@ -0,0 +1,86 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+
+from .constants import EXPORT_CHUNK_SIZE
+from .models import Comment, Post
+
+EXPORT_COLUMNS = {
+    Post: {
+        'id': 'id',
+        'title': 'title',
+        'text': 'text',
+        'pub_date': 'pub_date',
+        'is_published': 'is_published',
+        'author_id': 'author_id',
+        'author_username': F('author__username'),
+        'category_id': 'category_id',
+        'location_id': 'location_id',
+        'image': 'image',
+        'comment_count': 'comment_count',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+    },
+    Comment: {
+        'id': 'id',
+        'post_id': 'post_id',
+        'author_id': 'author_id',
+        'author_username': F('author__username'),
+        'text': 'text',
+        'created_at': 'created_at',
+    },
+}
+
+
+class Echo:
+    """Псевдофайл для csv.writer: возвращает строку, а не пишет её."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset, since=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Строки выгрузки словарями; iterator() читает курсор порциями,
+    поэтому память не растёт с размером таблицы.
+    """
+    columns = EXPORT_COLUMNS[queryset.model]
+    if since is not None:
+        queryset = queryset.filter(created_at__gte=since)
+    fields = [name for name, source in columns.items() if source == name]
+    expressions = {
+        name: source for name, source in columns.items() if source != name
+    }
+    return (
+        queryset.order_by('pk')
+        .values(*fields, **expressions)
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def iter_jsonl(queryset, **kwargs):
+    for row in export_rows(queryset, **kwargs):
+        yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False)
+        yield '\n'
+
+
+def iter_csv(queryset, **kwargs):
+    columns = list(EXPORT_COLUMNS[queryset.model])
+    writer = csv.DictWriter(Echo(), fieldnames=columns)
+    yield writer.writeheader()
+    encoder = DjangoJSONEncoder()
+    for row in export_rows(queryset, **kwargs):
+        yield writer.writerow({
+            name: encoder.default(value)
+            if not isinstance(value, (str, int, float, type(None)))
+            else value
+            for name, value in row.items()
+        })
+
+
+EXPORT_FORMATS = {
+    'jsonl': (iter_jsonl, 'application/x-ndjson'),
+    'csv': (iter_csv, 'text/csv'),
+}
@@ -0,0 +1,87 @@
+import logging
+import posixpath
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from blog.cache import bump_page_cache_version
+from blog.constants import IMAGE_VARIANT_WIDTHS, IMAGE_WEBP_QUALITY
+from blog.models import Post
+from core.jobs import enqueue, job
+
+VARIANTS_DIR = 'variants'
+
+logger = logging.getLogger(__name__)
+
+
+def variant_name(name, width):
+    """posts/photo.jpg → posts/variants/photo_640.webp."""
+    folder, filename = posixpath.split(name)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(folder, VARIANTS_DIR, f'{stem}_{width}.webp')
+
+
+def has_alpha(image):
+    return image.mode in ('RGBA', 'LA') or (
+        image.mode == 'P' and 'transparency' in image.info
+    )
+
+
+def make_variants(name, storage=default_storage,
+                  widths=IMAGE_VARIANT_WIDTHS):
+    """
+    Уменьшенные копии изображения в WebP. Больше оригинала картинка
+    не растягивается: узкая даёт один вариант в родной ширине.
+    """
+    with storage.open(name) as source, Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        image = image.convert('RGBA' if has_alpha(image) else 'RGB')
+    files = []
+    for width in sorted({min(width, image.width) for width in widths}):
+        height = max(1, round(image.height * width / image.width))
+        buffer = BytesIO()
+        image.resize(
+            (width, height), Image.Resampling.LANCZOS, reducing_gap=3.0
+        ).save(buffer, 'WEBP', quality=IMAGE_WEBP_QUALITY)
+        target = variant_name(name, width)
+        storage.delete(target)
+        files.append(
+            [width, storage.save(target, ContentFile(buffer.getvalue()))]
+        )
+    return {
+        'name': name,
+        'width': image.width,
+        'height': image.height,
+        'files': files,
+    }
+
+
+def try_make_variants(name):
+    """make_variants для пула: битый файл не роняет остальные."""
+    try:
+        return make_variants(name)
+    except OSError:
+        logger.exception('Не удалось нарезать варианты %s', name)
+        return None
+
+
+def store_variants(post_id, variants):
+    """Сохраняет варианты, если за время нарезки картинку не сменили."""
+    return Post.objects.filter(pk=post_id, image=variants['name']).update(
+        image_variants=variants, updated_at=timezone.now()
+    )
+
+
+@job
+def process_post_image(post_id, name):
+    variants = try_make_variants(name)
+    if variants and store_variants(post_id, variants):
+        bump_page_cache_version()
+
+
+def schedule_variants(post):
+    """Нарезка идёт в воркере очереди, запрос Pillow не ждёт."""
+    enqueue(process_post_image, post.pk, post.image.name)
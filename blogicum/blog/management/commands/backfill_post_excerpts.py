@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.constants import EXCERPT_BACKFILL_CHUNK_SIZE
+from blog.models import Post, text_stats
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает анонсы и время чтения постов порциями по id.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=EXCERPT_BACKFILL_CHUNK_SIZE,
+            help='Сколько постов обрабатывать в одной транзакции.',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        last_id = 0
+        fixed = 0
+        while True:
+            with transaction.atomic():
+                posts = list(
+                    Post.objects.filter(id__gt=last_id).order_by('id')
+                    .only('id', 'text', 'excerpt', 'reading_time')[:chunk_size]
+                )
+                if not posts:
+                    break
+                stale = []
+                for post in posts:
+                    stats = text_stats(post.text)
+                    if (post.excerpt, post.reading_time) != stats:
+                        post.excerpt, post.reading_time = stats
+                        stale.append(post)
+                Post.objects.bulk_update(stale, ['excerpt', 'reading_time'])
+            fixed += len(stale)
+            last_id = posts[-1].id
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено анонсов: {fixed}')
+        )
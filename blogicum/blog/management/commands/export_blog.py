@@ -0,0 +1,61 @@
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from blog.constants import EXPORT_CHUNK_SIZE
+from blog.export import EXPORT_FORMATS
+from blog.models import Comment, Post
+
+EXPORT_MODELS = {'posts': Post, 'comments': Comment}
+
+
+def parse_since(value):
+    """Дата или дата-время в ISO 8601; наивное время — в текущей зоне."""
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise CommandError(f'Неверная дата --since: {value}')
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково выгружает посты или комментарии в JSONL или CSV '
+        'без загрузки таблицы в память.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=EXPORT_MODELS)
+        parser.add_argument(
+            '--format', choices=EXPORT_FORMATS, default='jsonl')
+        parser.add_argument(
+            '--since', default=None,
+            help='Только записи, созданные не раньше этого момента.')
+        parser.add_argument(
+            '-o', '--output', default=None,
+            help='Файл выгрузки; по умолчанию stdout.')
+        parser.add_argument(
+            '--chunk-size', type=int, default=EXPORT_CHUNK_SIZE,
+            help='Строк, читаемых из курсора за раз.')
+
+    def handle(self, *args, **options):
+        render, _ = EXPORT_FORMATS[options['format']]
+        since = options['since']
+        chunks = render(
+            EXPORT_MODELS[options['model']].objects.all(),
+            since=since and parse_since(since),
+            chunk_size=options['chunk_size'],
+        )
+        if options['output'] is None:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf-8',
+                  newline='') as output:
+            output.writelines(chunks)
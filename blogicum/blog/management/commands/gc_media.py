@@ -0,0 +1,106 @@
+import posixpath
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from blog.models import Post
+
+GC_MIN_AGE_SECONDS = 60 * 60
+GC_CHUNK_SIZE = 2000
+
+# Все имена, на которые ссылаются посты: оригиналы и WebP-копии из
+# image_variants['files'] ([ширина, имя]). Сортирует и убирает повторы
+# SQLite, а не Python.
+REFERENCED_NAMES_SQL = (
+    "SELECT image AS name FROM {table} "
+    "WHERE image IS NOT NULL AND image != '' "
+    "UNION "
+    "SELECT json_extract(file.value, '$[1]') FROM {table}, "
+    "json_each({table}.image_variants, '$.files') AS file "
+    "ORDER BY name"
+)
+
+
+def walk(storage, folder):
+    """
+    Все файлы под folder, рекурсивно, в порядке сравнения полных путей:
+    папка сортируется как «имя/», так что posts/ab.jpg идёт раньше
+    posts/ab/….
+    """
+    directories, files = storage.listdir(folder)
+    entries = sorted(
+        [(name, False) for name in files]
+        + [(name + '/', True) for name in directories]
+    )
+    for name, is_directory in entries:
+        path = posixpath.join(folder, name.rstrip('/'))
+        if is_directory:
+            yield from walk(storage, path)
+        else:
+            yield path
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет картинки, на которые не ссылается ни один пост: ни '
+        'Post.image, ни его WebP-копии. Ссылки читаются из базы потоком '
+        'в порядке имён и сливаются с обходом хранилища.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-age', type=int, default=GC_MIN_AGE_SECONDS,
+            help='Не трогать файлы моложе стольких секунд: их пост '
+                 'может быть ещё не сохранён.')
+        parser.add_argument('--chunk-size', type=int, default=GC_CHUNK_SIZE)
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только показать, что было бы удалено.')
+
+    def referenced_names(self, chunk_size):
+        """Ссылки из базы по возрастанию, порциями по chunk_size."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                REFERENCED_NAMES_SQL.format(table=Post._meta.db_table)
+            )
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    return
+                for (name,) in rows:
+                    yield name
+
+    def handle(self, *args, **options):
+        storage = default_storage
+        folder = Post._meta.get_field('image').upload_to
+        if not storage.exists(folder):
+            return
+        # Отсечка берётся до чтения ссылок: файл, загруженный позже,
+        # окажется моложе её и уцелеет.
+        cutoff = timezone.now() - timedelta(seconds=options['min_age'])
+        # Слияние двух отсортированных потоков: файлов хранилища и
+        # ссылок из базы, — без множества всех ссылок в памяти.
+        references = self.referenced_names(options['chunk_size'])
+        reference = next(references, None)
+        checked = removed = freed = 0
+        for name in walk(storage, folder):
+            checked += 1
+            while reference is not None and reference < name:
+                reference = next(references, None)
+            if name == reference or storage.get_modified_time(name) > cutoff:
+                continue
+            freed += storage.size(name)
+            removed += 1
+            if options['dry_run']:
+                self.stdout.write(name)
+            else:
+                storage.delete(name)
+        references.close()
+        verb = 'Будет удалено' if options['dry_run'] else 'Удалено'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} файлов: {removed} ({freed / 2**20:.1f} МБ), '
+            f'проверено файлов: {checked}'
+        ))
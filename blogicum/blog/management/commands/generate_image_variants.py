@@ -0,0 +1,69 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.cache import bump_page_cache_version
+from blog.constants import IMAGE_BACKFILL_BATCH_SIZE
+from blog.images import store_variants, try_make_variants
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Нарезает WebP-копии картинок существующих постов. Pillow '
+        'отпускает GIL при сжатии, поэтому картинки обрабатываются '
+        'параллельно пулом потоков.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Сколько картинок обрабатывать одновременно.')
+        parser.add_argument(
+            '--batch-size', type=int, default=IMAGE_BACKFILL_BATCH_SIZE,
+            help='Картинок между записями в базу.')
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Нарезать заново и уже обработанные картинки.')
+
+    def handle(self, *args, **options):
+        started = perf_counter()
+        posts = Post.objects.exclude(image='').exclude(image__isnull=True)
+        last_pk = 0
+        done = failed = 0
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            while True:
+                rows = list(
+                    posts.filter(pk__gt=last_pk).order_by('pk')
+                    .values_list('pk', 'image', 'image_variants')
+                    [:options['batch_size']]
+                )
+                if not rows:
+                    break
+                last_pk = rows[-1][0]
+                batch = [
+                    (pk, name) for pk, name, variants in rows
+                    if options['force'] or variants.get('name') != name
+                ]
+                # Нарезка целиком до транзакции: иначе после первого
+                # UPDATE блокировка записи SQLite держалась бы, пока
+                # Pillow дорезает остальные картинки пачки.
+                results = list(pool.map(
+                    try_make_variants, [name for _, name in batch]
+                ))
+                with transaction.atomic():
+                    for (pk, _), variants in zip(batch, results):
+                        if variants is None:
+                            failed += 1
+                        else:
+                            done += store_variants(pk, variants)
+        if done:
+            bump_page_cache_version()
+        elapsed = perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано картинок: {done}, с ошибками: {failed} '
+            f'за {elapsed:.1f} с'
+        ))
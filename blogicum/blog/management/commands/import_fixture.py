@@ -0,0 +1,242 @@
+import json
+import os
+import tempfile
+from time import perf_counter
+
+from django.apps import apps
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.core.serializers.base import DeserializationError
+from django.core.serializers.python import Deserializer
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from blog.cache import bump_page_cache_version
+from blog.constants import IMPORT_BATCH_SIZE
+from blog.streaming import iter_json_array
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_memory_mb():
+    """Пиковый RSS процесса; на Linux ru_maxrss в килобайтах."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def dependency_order(models):
+    """
+    Модели в порядке зависимостей по внешним ключам:
+    категории и места → пользователи → посты → комментарии.
+    """
+    pending = list(models)
+    ordered = []
+    while pending:
+        for model in pending:
+            dependencies = {
+                field.related_model for field in model._meta.concrete_fields
+                if field.is_relation and field.related_model is not model
+            }
+            if not dependencies & set(pending):
+                break
+        else:
+            raise CommandError(
+                'Циклическая зависимость между моделями: '
+                + ', '.join(model._meta.label for model in pending)
+            )
+        pending.remove(model)
+        ordered.append(model)
+    return ordered
+
+
+def auto_timestamp_fields(model):
+    """Поля, которые bulk_create заполняет текущим временем."""
+    return [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False)
+        or getattr(field, 'auto_now_add', False)
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково загружает дамп в формате dumpdata (JSON): строки '
+        'раскладываются по моделям и вставляются пачками bulk_create '
+        'в порядке зависимостей.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('fixture', help='Путь к JSON-дампу.')
+        parser.add_argument(
+            '--batch-size', type=int, default=IMPORT_BATCH_SIZE,
+            help='Строк в одной транзакции.')
+        parser.add_argument(
+            '-e', '--exclude', action='append', default=[],
+            help='Пропустить модель (app_label.ModelName), можно повторять.')
+        parser.add_argument(
+            '--ignore-conflicts', action='store_true',
+            help='Пропускать строки с уже существующим первичным ключом.')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.using = options['database']
+        self.ignore_conflicts = options['ignore_conflicts']
+        excluded = {label.lower() for label in options['exclude']}
+        started = perf_counter()
+        with tempfile.TemporaryDirectory() as spill_dir:
+            spilled = self.spill(options['fixture'], spill_dir, excluded)
+            models = dependency_order(spilled)
+            total = 0
+            for model in models:
+                total += self.load(model, spilled[model])
+            self.reset_sequences(models)
+        labels = {model._meta.label_lower for model in models}
+        if {'blog.post', 'blog.comment'} & labels:
+            call_command('recount_comments', stdout=self.stdout)
+        if 'blog.post' in labels:
+            call_command('backfill_post_excerpts', stdout=self.stdout)
+        if {'blog.post', 'blog.category', 'auth.user'} & labels:
+            call_command('rebuild_autocomplete', stdout=self.stdout)
+        bump_page_cache_version()
+        elapsed = perf_counter() - started
+        memory = peak_memory_mb()
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено {total} строк за {elapsed:.1f} с '
+            f'({total / elapsed if elapsed else total:.0f} строк/с)'
+            + (f', пик памяти {memory:.0f} МБ' if memory else '')
+        ))
+
+    def spill(self, path, spill_dir, excluded):
+        """
+        Первый проход: раскладывает строки дампа по временным JSONL-файлам
+        моделей, чтобы потом грузить их в нужном порядке.
+        """
+        files = {}
+        try:
+            with open(path, encoding='utf-8') as stream:
+                for row in iter_json_array(stream):
+                    label = row['model'].lower()
+                    if label in excluded or row['model'] in excluded:
+                        continue
+                    model = apps.get_model(label)
+                    if model not in files:
+                        files[model] = open(
+                            os.path.join(spill_dir, f'{label}.jsonl'),
+                            'w', encoding='utf-8'
+                        )
+                    files[model].write(json.dumps(row) + '\n')
+        except (ValueError, KeyError, LookupError) as error:
+            raise CommandError(f'Не удалось разобрать {path}: {error}')
+        finally:
+            for spill in files.values():
+                spill.close()
+        return {model: spill.name for model, spill in files.items()}
+
+    def read_batches(self, spill_path):
+        with open(spill_path, encoding='utf-8') as spill:
+            batch = []
+            for line in spill:
+                batch.append(json.loads(line))
+                if len(batch) >= self.batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+    def load(self, model, spill_path):
+        """Второй проход: пачка строк — одна транзакция."""
+        started = perf_counter()
+        count = 0
+        manager = model._base_manager.using(self.using)
+        timestamp_fields = auto_timestamp_fields(model)
+        for batch in self.read_batches(spill_path):
+            try:
+                objects = list(Deserializer(
+                    batch, using=self.using, ignorenonexistent=True,
+                    handle_forward_references=False,
+                ))
+            except DeserializationError as error:
+                raise CommandError(str(error))
+            instances = [deserialized.object for deserialized in objects]
+            dumped = [
+                [getattr(instance, field.attname) for field in
+                 timestamp_fields]
+                for instance in instances
+            ]
+            with transaction.atomic(using=self.using):
+                existing = set()
+                if self.ignore_conflicts and timestamp_fields:
+                    existing = set(manager.filter(
+                        pk__in=[instance.pk for instance in instances]
+                    ).values_list('pk', flat=True))
+                manager.bulk_create(
+                    instances, ignore_conflicts=self.ignore_conflicts
+                )
+                if timestamp_fields:
+                    self.restore_timestamps(
+                        manager, timestamp_fields, instances, dumped,
+                        existing,
+                    )
+                self.load_m2m(model, objects)
+            count += len(objects)
+        elapsed = perf_counter() - started
+        self.stdout.write(
+            f'{model._meta.label}: {count} строк за {elapsed:.1f} с '
+            f'({count / elapsed if elapsed else count:.0f} строк/с)'
+        )
+        return count
+
+    def restore_timestamps(self, manager, fields, instances, dumped,
+                           existing):
+        """
+        bulk_create перезаписывает auto_now/auto_now_add текущим
+        временем; даты из дампа возвращаются явным UPDATE. Строки,
+        пропущенные из-за --ignore-conflicts, не трогаются.
+        """
+        restored = []
+        for instance, values in zip(instances, dumped):
+            if instance.pk in existing:
+                continue
+            for field, value in zip(fields, values):
+                if value is not None:
+                    setattr(instance, field.attname, value)
+            restored.append(instance)
+        manager.bulk_update(
+            restored, [field.name for field in fields],
+            batch_size=self.batch_size,
+        )
+
+    def load_m2m(self, model, objects):
+        """Связи many-to-many — строками through-модели по *_id."""
+        for field in model._meta.many_to_many:
+            through = field.remote_field.through
+            source = through._meta.get_field(field.m2m_field_name()).attname
+            target = through._meta.get_field(
+                field.m2m_reverse_field_name()
+            ).attname
+            rows = [
+                through(**{
+                    source: deserialized.object.pk,
+                    target: related_pk,
+                })
+                for deserialized in objects
+                for related_pk in deserialized.m2m_data.get(field.name, ())
+            ]
+            if rows:
+                through._base_manager.using(self.using).bulk_create(
+                    rows, ignore_conflicts=self.ignore_conflicts
+                )
+
+    def reset_sequences(self, models):
+        """Как loaddata: сдвигает счётчики id после вставки с явными pk."""
+        connection = connections[self.using]
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
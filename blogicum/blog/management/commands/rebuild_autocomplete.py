@@ -0,0 +1,16 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from blog.autocomplete import rebuild_entries
+
+
+class Command(BaseCommand):
+    help = 'Пересобирает префиксный индекс подсказок поиска.'
+
+    def handle(self, *args, **options):
+        started = perf_counter()
+        total = rebuild_entries()
+        self.stdout.write(self.style.SUCCESS(
+            f'Подсказок: {total} за {perf_counter() - started:.1f} с'
+        ))
@@ -0,0 +1,29 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from blog import search
+
+
+class Command(BaseCommand):
+    help = (
+        'Перестраивает полнотекстовый индекс постов и восстанавливает '
+        'его триггеры.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        using = options['database']
+        if not search.is_available(connections[using]):
+            raise CommandError(
+                'Нет таблицы полнотекстового индекса: выполните migrate.'
+            )
+        started = perf_counter()
+        search.install_triggers(using)
+        search.rebuild_index(using)
+        self.stdout.write(self.style.SUCCESS(
+            f'Индекс перестроен за {perf_counter() - started:.1f} с'
+        ))
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from blog.constants import COMMENT_RECOUNT_CHUNK_SIZE
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает Post.comment_count порциями по id постов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=COMMENT_RECOUNT_CHUNK_SIZE,
+            help='Сколько постов обрабатывать в одной транзакции.',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        last_id = 0
+        fixed = 0
+        while True:
+            ids = list(
+                Post.objects.filter(id__gt=last_id)
+                .order_by('id')
+                .values_list('id', flat=True)[:chunk_size]
+            )
+            if not ids:
+                break
+            fixed += self.recount(ids)
+            last_id = ids[-1]
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлено счётчиков: {fixed}')
+        )
+
+    def recount(self, ids):
+        """Пересчитывает счётчики для одной порции постов."""
+        with transaction.atomic():
+            # Подсчёт и запись в одной транзакции: комментарий,
+            # добавленный между ними, не затрётся старым числом.
+            counts = dict(
+                Comment.objects.filter(post_id__in=ids)
+                .values_list('post_id')
+                .annotate(total=Count('id'))
+                .order_by()
+            )
+            posts = list(
+                Post.objects.filter(id__in=ids).only('id', 'comment_count')
+            )
+            stale = []
+            for post in posts:
+                actual = counts.get(post.id, 0)
+                if post.comment_count != actual:
+                    post.comment_count = actual
+                    stale.append(post)
+            Post.objects.bulk_update(stale, ['comment_count'])
+        return len(stale)
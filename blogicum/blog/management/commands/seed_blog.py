@@ -0,0 +1,220 @@
+import random
+from datetime import timedelta
+from itertools import accumulate
+from time import perf_counter
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from faker import Faker
+
+from blog.autocomplete import rebuild_entries
+from blog.cache import bump_page_cache_version
+from blog.constants import (SEED_BATCH_SIZE, SEED_FUTURE_POSTS_SHARE,
+                            SEED_POSTS_PERIOD_DAYS, SEED_TEXT_POOL_SIZE,
+                            SEED_UNPUBLISHED_SHARE)
+from blog.models import Category, Comment, Location, Post, User, text_stats
+
+
+def zipf_weights(n, exponent):
+    """Накопленные веса «длинного хвоста»: первые элементы популярнее."""
+    return list(accumulate(1 / (rank ** exponent) for rank in range(1, n + 1)))
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу синтетическими пользователями, категориями, '
+        'местами, постами и комментариями пачками bulk_create.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--locations', type=int, default=100)
+        parser.add_argument('--posts', type=int, default=100000)
+        parser.add_argument('--comments', type=int, default=500000)
+        parser.add_argument(
+            '--batch-size', type=int, default=SEED_BATCH_SIZE,
+            help='Строк в одной транзакции.')
+        parser.add_argument(
+            '--author-skew', type=float, default=1.0,
+            help='Показатель Ципфа для распределения постов по авторам.')
+        parser.add_argument(
+            '--post-skew', type=float, default=1.0,
+            help='Показатель Ципфа для распределения комментариев.')
+        parser.add_argument(
+            '--password', default=None,
+            help='Общий пароль пользователей; по умолчанию вход запрещён.')
+        parser.add_argument('--seed', type=int, default=None)
+
+    @staticmethod
+    def check_counts(options):
+        """Ошибки в числах ловятся до вставки первой строки."""
+        for name in (
+            'users', 'categories', 'locations', 'posts', 'comments',
+        ):
+            if options[name] < 0:
+                raise CommandError(f'--{name} не может быть меньше нуля.')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть больше нуля.')
+        if options['posts'] and not (
+            options['users'] and options['categories']
+        ):
+            raise CommandError(
+                'Для постов нужны хотя бы один пользователь и категория.')
+        if options['comments'] and not options['posts']:
+            raise CommandError('Для комментариев нужен хотя бы один пост.')
+
+    def handle(self, *args, **options):
+        self.check_counts(options)
+        self.batch_size = options['batch_size']
+        self.random = random.Random(options['seed'])
+        self.faker = Faker('ru_RU')
+        if options['seed'] is not None:
+            self.faker.seed_instance(options['seed'])
+        self.sentences = [
+            self.faker.sentence() for _ in range(SEED_TEXT_POOL_SIZE)
+        ]
+        self.paragraphs = [
+            self.faker.paragraph(nb_sentences=8)
+            for _ in range(SEED_TEXT_POOL_SIZE)
+        ]
+        self.now = timezone.now()
+
+        user_ids = self.seed_users(options['users'], options['password'])
+        category_ids = self.seed_categories(options['categories'])
+        location_ids = self.seed_locations(options['locations'])
+        post_ids, comment_posts = self.seed_posts(
+            options['posts'], options['comments'], user_ids, category_ids,
+            location_ids, options['author_skew'], options['post_skew'],
+        )
+        self.seed_comments(comment_posts, post_ids, user_ids)
+        # bulk_create обходит сигналы, поэтому подсказки — целиком.
+        rebuild_entries()
+        bump_page_cache_version()
+
+    def next_id(self, model):
+        # Скрытые, но ещё не удалённые строки тоже занимают id.
+        return (
+            model._base_manager.aggregate(last=Max('id'))['last'] or 0
+        ) + 1
+
+    def insert(self, model, rows, total):
+        """Вставляет строки пачками, каждая пачка — своя транзакция."""
+        started = perf_counter()
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                with transaction.atomic():
+                    model.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+        elapsed = perf_counter() - started
+        self.stdout.write(
+            f'{model._meta.verbose_name_plural}: {total} за {elapsed:.1f} с '
+            f'({total / elapsed if elapsed else total:.0f} строк/с)'
+        )
+
+    def seed_users(self, count, password):
+        first_id = self.next_id(User)
+        password = make_password(password) if password else '!'
+        self.insert(User, (
+            User(
+                id=first_id + i,
+                username=f'{self.faker.user_name()}_{first_id + i}',
+                first_name=self.faker.first_name(),
+                last_name=self.faker.last_name(),
+                password=password,
+                date_joined=self.now,
+            )
+            for i in range(count)
+        ), count)
+        return list(range(first_id, first_id + count))
+
+    def seed_categories(self, count):
+        first_id = self.next_id(Category)
+        self.insert(Category, (
+            Category(
+                id=first_id + i,
+                title=self.random.choice(self.sentences)[:40],
+                description=self.random.choice(self.paragraphs),
+                slug=f'category-{first_id + i}',
+            )
+            for i in range(count)
+        ), count)
+        return list(range(first_id, first_id + count))
+
+    def seed_locations(self, count):
+        first_id = self.next_id(Location)
+        self.insert(Location, (
+            Location(id=first_id + i, name=self.faker.city())
+            for i in range(count)
+        ), count)
+        return list(range(first_id, first_id + count))
+
+    def seed_posts(self, count, comments, user_ids, category_ids,
+                   location_ids, author_skew, post_skew):
+        """
+        Посты вставляются уже с comment_count: адресаты комментариев
+        выбираются заранее, «горячие» посты получают львиную долю.
+        """
+        first_id = self.next_id(Post)
+        post_ids = list(range(first_id, first_id + count))
+        comment_posts = self.random.choices(
+            range(count), cum_weights=zipf_weights(count, post_skew),
+            k=comments
+        ) if count else []
+        # Популярные посты разбросаны по ленте, а не собраны в её начале.
+        self.random.shuffle(post_ids)
+        counts = [0] * count
+        for index in comment_posts:
+            counts[index] += 1
+        authors = self.random.choices(
+            user_ids, cum_weights=zipf_weights(len(user_ids), author_skew),
+            k=count
+        ) if count else []
+        rnd = self.random
+        period = SEED_POSTS_PERIOD_DAYS * 24 * 3600
+        location_choices = location_ids + [None]
+
+        def pub_date():
+            if rnd.random() < SEED_FUTURE_POSTS_SHARE:
+                seconds = rnd.randrange(period // 12)
+                return self.now + timedelta(seconds=seconds)
+            return self.now - timedelta(seconds=rnd.randrange(period))
+
+        def make_post(i):
+            text = '\n\n'.join(rnd.sample(self.paragraphs, 3))
+            excerpt, reading_time = text_stats(text)
+            return Post(
+                id=post_ids[i],
+                author_id=authors[i],
+                title=rnd.choice(self.sentences),
+                text=text,
+                excerpt=excerpt,
+                reading_time=reading_time,
+                pub_date=pub_date(),
+                category_id=rnd.choice(category_ids),
+                location_id=rnd.choice(location_choices),
+                is_published=rnd.random() > SEED_UNPUBLISHED_SHARE,
+                comment_count=counts[i],
+            )
+
+        self.insert(Post, (make_post(i) for i in range(count)), count)
+        return post_ids, comment_posts
+
+    def seed_comments(self, comment_posts, post_ids, user_ids):
+        rnd = self.random
+        self.insert(Comment, (
+            Comment(
+                author_id=rnd.choice(user_ids),
+                post_id=post_ids[index],
+                text=rnd.choice(self.sentences),
+            )
+            for index in comment_posts
+        ), len(comment_posts))
@@ -0,0 +1,53 @@
+import sqlite3
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from blog.cache import bump_page_cache_version
+
+BACKUP_PAGES_PER_STEP = 1024
+
+
+def copy_database(source, target_path, pages=BACKUP_PAGES_PER_STEP):
+    """
+    Копирует открытую SQLite-базу в файл через online backup API:
+    по pages страниц за шаг, не останавливая запись в источник
+    и не ломая открытые соединения к цели.
+    """
+    target = sqlite3.connect(str(target_path))
+    try:
+        source.backup(target, pages=pages)
+    finally:
+        target.close()
+
+
+class Command(BaseCommand):
+    help = 'Обновляет файл реплики копией основной SQLite-базы.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--replica', default='replica')
+        parser.add_argument(
+            '--pages', type=int, default=BACKUP_PAGES_PER_STEP,
+            help='Страниц, копируемых за один шаг.')
+
+    def handle(self, *args, **options):
+        alias = options['replica']
+        if alias not in connections.databases:
+            raise CommandError(f'Нет базы с псевдонимом {alias}.')
+        primary = connections[DEFAULT_DB_ALIAS]
+        replica = connections[alias]
+        if primary.vendor != 'sqlite' or replica.vendor != 'sqlite':
+            raise CommandError('Синхронизация возможна только для SQLite.')
+        target_path = replica.settings_dict['NAME']
+        if str(target_path) == str(primary.settings_dict['NAME']):
+            raise CommandError('Реплика указывает на файл основной базы.')
+        started = perf_counter()
+        primary.ensure_connection()
+        copy_database(primary.connection, target_path, options['pages'])
+        replica.close()
+        # Страницы, закэшированные со старой копии, больше не нужны.
+        bump_page_cache_version()
+        self.stdout.write(self.style.SUCCESS(
+            f'Реплика {alias} обновлена за {perf_counter() - started:.2f} с'
+        ))
@@ -0,0 +1,88 @@
+# Generated by Django 3.2.16 on 2026-10-18 04:51
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import re
+
+KEY_LENGTH = 64
+MAX_WORDS = 8
+
+
+def entry_keys(label):
+    text = re.sub(r'\s+', ' ', label).strip().lower()
+    keys = [
+        text[match.start():][:KEY_LENGTH]
+        for match in re.finditer(r'(?<!\w)\w', text)
+    ][:MAX_WORDS]
+    return list(dict.fromkeys(keys))
+
+
+def fill_entries(apps, schema_editor):
+    Entry = apps.get_model('blog', 'AutocompleteEntry')
+    Post = apps.get_model('blog', 'Post')
+    Category = apps.get_model('blog', 'Category')
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    sources = (
+        (Post.objects.values_list(
+            'pk', 'title', 'category_id', 'is_published', 'pub_date'),
+         lambda pk, title, category_id, is_published, pub_date: {
+             'kind': 'post', 'label': title, 'target': str(pk),
+             'post_id': pk, 'category_id': category_id,
+             'is_published': is_published, 'pub_date': pub_date}),
+        (Category.objects.values_list('pk', 'title', 'slug'),
+         lambda pk, title, slug: {
+             'kind': 'category', 'label': title, 'target': slug,
+             'category_id': pk, 'is_published': True}),
+        (User.objects.values_list('pk', 'username', 'is_active'),
+         lambda pk, username, is_active: {
+             'kind': 'user', 'label': username, 'target': username,
+             'user_id': pk, 'is_published': is_active}),
+    )
+    for rows, make_fields in sources:
+        batch = []
+        for row in rows.iterator():
+            fields = make_fields(*row)
+            batch.extend(
+                Entry(key=key, **fields)
+                for key in entry_keys(fields['label'])
+            )
+            if len(batch) >= 2000:
+                Entry.objects.bulk_create(batch)
+                batch = []
+        Entry.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0012_post_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AutocompleteEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64)),
+                ('kind', models.CharField(choices=[('post', 'Публикация'), ('category', 'Категория'), ('user', 'Пользователь')], max_length=8)),
+                ('label', models.CharField(max_length=256)),
+                ('target', models.CharField(max_length=256)),
+                ('is_published', models.BooleanField()),
+                ('pub_date', models.DateTimeField(null=True)),
+                ('category', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='blog.category')),
+                ('post', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='blog.post')),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'подсказка поиска',
+                'verbose_name_plural': 'Подсказки поиска',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='autocompleteentry',
+            index=models.Index(fields=['key'], name='autocomplete_key_idx'),
+        ),
+        migrations.RunPython(fill_entries, migrations.RunPython.noop),
+    ]
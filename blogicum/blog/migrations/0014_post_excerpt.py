@@ -0,0 +1,45 @@
+# Generated by Django 3.2.16 on 2026-10-18 04:55
+
+import math
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+def fill_excerpts(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    last_id = 0
+    while True:
+        posts = list(
+            Post.objects.filter(id__gt=last_id).order_by('id')
+            .only('id', 'text')[:1000]
+        )
+        if not posts:
+            break
+        for post in posts:
+            post.excerpt = Truncator(post.text).words(10, truncate=' …')
+            post.reading_time = max(
+                1, math.ceil(len(post.text.split()) / 200))
+        Post.objects.bulk_update(posts, ['excerpt', 'reading_time'])
+        last_id = posts[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_autocompleteentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, verbose_name='Анонс'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='reading_time',
+            field=models.PositiveSmallIntegerField(default=1, editable=False, verbose_name='Время чтения, мин'),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-18 05:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0015_post_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='is_deleted',
+            field=models.BooleanField(default=False, editable=False, help_text='Пост скрыт и ждёт фонового удаления.', verbose_name='Удалён'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 3.2.16 on 2026-10-18 05:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('blog', '0017_base_updated_at_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserDeletion',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='deletion', serialize=False, to='auth.user', verbose_name='Пользователь')),
+                ('requested_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Запрошено')),
+            ],
+            options={
+                'verbose_name': 'удаление пользователя',
+                'verbose_name_plural': 'Удаления пользователей',
+            },
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='is_deleted',
+            field=models.BooleanField(default=False, editable=False, help_text='Автор удалён, комментарий ждёт фонового удаления.', verbose_name='Удалён'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 3.2.16 on 2026-10-18 05:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def link_pending_deletions(apps, schema_editor):
+    # До этой миграции посты автора с запросом на удаление не
+    # различались; считаем, что все они скрыты вместе с ним.
+    Post = apps.get_model('blog', 'Post')
+    UserDeletion = apps.get_model('blog', 'UserDeletion')
+    for request in UserDeletion.objects.all():
+        Post._base_manager.filter(
+            author_id=request.user_id, is_deleted=True
+        ).update(hidden_by_deletion=request)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0018_user_deletion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='hidden_by_deletion',
+            field=models.ForeignKey(blank=True, editable=False, help_text='Пост скрыт вместе с учётной записью автора и вернётся, если её снова включат.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='hidden_posts', to='blog.userdeletion', verbose_name='Скрыт удалением автора'),
+        ),
+        migrations.RunPython(link_pending_deletions, migrations.RunPython.noop),
+    ]
@@ -1,41 +1,123 @@
+import hashlib
+import math
+from datetime import datetime, timedelta
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import models
-from django.db.models import Count, Q
+from django.db.models import Q
 from django.db.models.query import QuerySet
 from django.utils import timezone
+from django.utils.text import Truncator
 
-from blog.constants import CHAR_LENGHT
+from blog import search
+from blog.constants import (AUTOCOMPLETE_KEY_LENGTH, CHAR_LENGHT,
+                            EXCERPT_WORDS, READING_WORDS_PER_MINUTE)
 from core.models import Base
 
 
 User = get_user_model()
 
 
+def floor_publication_time(moment):
+    """
+    Округляет время вниз до BLOG_PUBLICATION_CLOCK_GRANULARITY секунд,
+    чтобы запросы ленты в пределах одного интервала совпадали
+    и их можно было кешировать.
+    """
+    step = settings.BLOG_PUBLICATION_CLOCK_GRANULARITY
+    if not step:
+        return moment
+    timestamp = moment.timestamp()
+    return datetime.fromtimestamp(
+        timestamp - timestamp % step, tz=moment.tzinfo
+    )
+
+
+def text_stats(text):
+    """Анонс для карточки (как truncatewords) и минуты чтения текста."""
+    return (
+        Truncator(text).words(EXCERPT_WORDS, truncate=' …'),
+        max(1, math.ceil(len(text.split()) / READING_WORDS_PER_MINUTE)),
+    )
+
+
+def publication_now():
+    """Текущее время «часов публикации»."""
+    return floor_publication_time(timezone.now())
+
+
+def publication_visible_at(pub_date):
+    """Момент, когда «часы публикации» покажут пост с этой pub_date."""
+    return floor_publication_time(pub_date) + timedelta(
+        seconds=settings.BLOG_PUBLICATION_CLOCK_GRANULARITY
+    )
+
+
 class PostQuerySet(models.QuerySet):
     """Менеджер модели Post."""
 
+    # Всё, что читают includes/post_card.html и Post.card_version,
+    # плюс ключи пагинации по курсору.
+    CARD_FIELDS = (
+        'id', 'title', 'excerpt', 'reading_time', 'pub_date',
+        'is_published', 'image', 'image_variants', 'comment_count',
+        'author', 'author__username',
+        'category', 'category__slug', 'category__title',
+        'category__is_published',
+        'location', 'location__name', 'location__is_published',
+    )
+
     @classmethod
     def add_filter(cls, user_id, queryset):
         """Список постов автора."""
         q = Q(
             is_published=True,
             category__is_published=True,
-            pub_date__lt=timezone.now()
+            pub_date__lt=publication_now()
         )
 
         if user_id:
             q = q | Q(
                 author_id=user_id
             )
-        return queryset.filter(q).select_related(
+        return queryset.filter(q, is_deleted=False).select_related(
             'location',
             'category',
             'author'
         ).order_by(*Post._meta.ordering)
 
     @classmethod
-    def add_comments(cls, queryset):
-        return queryset.annotate(comment_count=Count('comments'))
+    def for_cards(cls, queryset):
+        """
+        Только колонки карточки поста: без текста, описаний категорий
+        и хешей паролей авторов.
+        """
+        return queryset.only(*cls.CARD_FIELDS)
+
+    @classmethod
+    def search(cls, queryset, text):
+        """
+        Посты queryset, найденные полнотекстовым индексом по text,
+        от самых релевантных.
+        """
+        return search.matching(queryset, text)
+
+    @classmethod
+    def next_publication_at(cls, queryset):
+        """
+        Момент, когда в queryset станет видна ближайшая отложенная
+        публикация; None, если отложенных публикаций нет.
+        """
+        pub_date = queryset.filter(
+            is_published=True,
+            is_deleted=False,
+            category__is_published=True,
+            pub_date__gte=publication_now()
+        ).order_by('pub_date').values_list('pub_date', flat=True).first()
+        if pub_date is None:
+            return None
+        return publication_visible_at(pub_date)
 
     def get_posts(self):
         """
@@ -47,6 +129,17 @@ class PostQuerySet(models.QuerySet):
         return self.add_filter(None, Post.objects)
 
 
+class LiveManager(models.Manager):
+    """
+    Менеджер по умолчанию постов и комментариев: без строк, ждущих
+    фонового удаления. Все строки, включая скрытые, — через
+    Model._base_manager.
+    """
+
+    def get_queryset(self) -> QuerySet:
+        return super().get_queryset().filter(is_deleted=False)
+
+
 class PostManager(models.Manager):
     """Делает запрос к модели Post и связанным моделям Location, Category."""
 
@@ -82,13 +175,101 @@ class Post(Base):
         verbose_name='Категория',
         related_name='posts')
     image = models.ImageField(null=True, blank=True, upload_to='posts')
-    objects = models.Manager()
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Уменьшенные копии изображения')
+    is_deleted = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Удалён',
+        help_text='Пост скрыт и ждёт фонового удаления.')
+    hidden_by_deletion = models.ForeignKey(
+        'UserDeletion',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='hidden_posts',
+        verbose_name='Скрыт удалением автора',
+        help_text='Пост скрыт вместе с учётной записью автора и '
+                  'вернётся, если её снова включат.')
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев')
+    excerpt = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name='Анонс')
+    reading_time = models.PositiveSmallIntegerField(
+        default=1,
+        editable=False,
+        verbose_name='Время чтения, мин')
+    objects = LiveManager()
     published = PostManager()
 
     class Meta:
         verbose_name = 'Публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                condition=Q(is_published=True),
+                name='post_published_pub_date_idx'),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_pub_date_idx'),
+            models.Index(
+                fields=('category', '-pub_date', '-id'),
+                name='post_category_pub_date_idx'),
+        )
+
+    def save(self, *args, **kwargs):
+        """Анонс и время чтения пересчитываются вместе с текстом."""
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'text' in update_fields:
+            self.excerpt, self.reading_time = text_stats(self.text)
+            if update_fields is not None:
+                kwargs['update_fields'] = {
+                    *update_fields, 'excerpt', 'reading_time'
+                }
+        super().save(*args, **kwargs)
+
+    @property
+    def image_srcset(self):
+        """Атрибут srcset из готовых WebP-копий; пусто, пока их нет."""
+        variants = self.image_variants
+        if not self.image or variants.get('name') != self.image.name:
+            return ''
+        return ', '.join(
+            f'{self.image.storage.url(name)} {width}w'
+            for width, name in variants['files']
+        )
+
+    @property
+    def card_version(self):
+        """
+        Отпечаток всего, что выводит includes/post_card.html:
+        меняется при правке поста, категории, места, имени автора
+        или числа комментариев. Полный текст не нужен — карточка
+        показывает только анонс, поэтому списки откладывают text.
+        """
+        category = self.category
+        location = self.location
+        parts = (
+            self.title, self.excerpt, self.reading_time,
+            self.pub_date.isoformat(),
+            self.is_published, self.image.name, self.image_srcset,
+            self.comment_count,
+            self.author.username,
+            category and (category.slug, category.title,
+                          category.is_published),
+            location and (location.name, location.is_published),
+        )
+        return hashlib.md5(repr(parts).encode()).hexdigest()
 
 
 class Category (Base):
@@ -146,10 +327,95 @@ class Comment(models.Model):
         verbose_name='публикация',
         related_name='comments'
     )
+    is_deleted = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Удалён',
+        help_text='Автор удалён, комментарий ждёт фонового удаления.')
+
+    objects = LiveManager()
+
+    # Пост, к которому комментарий был привязан при загрузке из базы:
+    # по нему сигнал переносит счётчик, если комментарий перевесили.
+    loaded_post_id = None
 
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_at_idx'),
+        )
 
     def __str__(self):
         return self.text
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.loaded_post_id = instance.__dict__.get('post_id')
+        return instance
+
+
+class UserDeletion(models.Model):
+    """
+    Запрос на удаление пользователя: пока он есть, а учётная запись
+    выключена, purge_user удаляет её содержимое. Выключенный
+    пользователь без этой строки просто заблокирован.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        verbose_name='Пользователь',
+        related_name='deletion')
+    requested_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Запрошено')
+
+    class Meta:
+        verbose_name = 'удаление пользователя'
+        verbose_name_plural = 'Удаления пользователей'
+
+    def __str__(self):
+        return str(self.user)
+
+
+class AutocompleteEntry(models.Model):
+    """
+    Строка префиксного индекса подсказок: ключ — нормализованный хвост
+    подписи, начиная с очередного слова. Подпись, адрес и признаки
+    видимости скопированы из источника, чтобы подсказки не читали
+    широкие строки blog_post. Для поста category — его категория.
+    """
+
+    POST = 'post'
+    CATEGORY = 'category'
+    USER = 'user'
+    KINDS = (
+        (POST, 'Публикация'),
+        (CATEGORY, 'Категория'),
+        (USER, 'Пользователь'),
+    )
+
+    key = models.CharField(max_length=AUTOCOMPLETE_KEY_LENGTH)
+    kind = models.CharField(max_length=8, choices=KINDS)
+    label = models.CharField(max_length=CHAR_LENGHT)
+    target = models.CharField(max_length=CHAR_LENGHT)
+    is_published = models.BooleanField()
+    pub_date = models.DateTimeField(null=True)
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE, null=True, related_name='+')
+    category = models.ForeignKey(
+        Category, on_delete=models.CASCADE, null=True, related_name='+')
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, null=True, related_name='+')
+
+    class Meta:
+        verbose_name = 'подсказка поиска'
+        verbose_name_plural = 'Подсказки поиска'
+        indexes = (
+            models.Index(fields=('key',), name='autocomplete_key_idx'),
+        )
@@ -0,0 +1,139 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+class InvalidCursor(Exception):
+    """Курсор не удалось разобрать."""
+
+
+class KeysetPage:
+    """Страница пагинации по курсору, совместимая с шаблонами Page."""
+
+    is_keyset = True
+
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Пагинация по ключу сортировки (seek method).
+    Вместо OFFSET и COUNT(*) страница выбирается условием
+    «строго после/до ключа последней показанной записи»,
+    поэтому любая страница стоит столько же, сколько первая.
+    Последнее поле ordering должно быть уникальным (обычно id).
+    """
+
+    def __init__(self, queryset, per_page, ordering):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+        self.fields = [name.lstrip('-') for name in self.ordering]
+
+    def window(self, cursor=None):
+        """
+        Запрос строк страницы (с одной лишней для has_next)
+        и параметры курсора, из которого она получена.
+        """
+        direction, values = (
+            self.decode_cursor(cursor) if cursor else (NEXT, None)
+        )
+        ordering = self.ordering
+        if direction == PREVIOUS:
+            ordering = tuple(self.reverse(name) for name in ordering)
+        queryset = self.queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self.seek_filter(ordering, values))
+        return direction, values, queryset[:self.per_page + 1]
+
+    def page(self, cursor=None):
+        direction, values, window = self.window(cursor)
+        rows = list(window)
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if direction == PREVIOUS:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+        return KeysetPage(
+            rows,
+            self.make_cursor(NEXT, rows[-1]) if rows and has_next else None,
+            self.make_cursor(PREVIOUS, rows[0])
+            if rows and has_previous else None,
+        )
+
+    @staticmethod
+    def reverse(name):
+        return name[1:] if name.startswith('-') else '-' + name
+
+    def seek_filter(self, ordering, values):
+        """
+        Условие «после ключа» для составной сортировки:
+        (a < x) OR (a = x AND b < y) OR ...
+        """
+        condition = Q()
+        equal = {}
+        for name, value in zip(ordering, values):
+            field = name.lstrip('-')
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f'{field}__{lookup}': value})
+            equal[field] = value
+        return condition
+
+    def make_cursor(self, direction, obj):
+        payload = [direction] + [
+            getattr(obj, field) for field in self.fields
+        ]
+        raw = json.dumps(payload, default=self.encode_value,
+                         separators=(',', ':'))
+        return urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def encode_value(value):
+        """Даты сохраняются с микросекундами, иначе ключ «поплывёт»."""
+        return value.isoformat()
+
+    def decode_cursor(self, cursor):
+        try:
+            raw = urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            direction, *values = json.loads(raw)
+            if direction not in (NEXT, PREVIOUS):
+                raise ValueError(direction)
+            if len(values) != len(self.fields):
+                raise ValueError(values)
+            model_meta = self.queryset.model._meta
+            values = [
+                model_meta.get_field(field).to_python(value)
+                for field, value in zip(self.fields, values)
+            ]
+        except (BinasciiError, ValueError, TypeError, ValidationError):
+            raise InvalidCursor(cursor)
+        return direction, values
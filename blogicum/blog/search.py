@@ -0,0 +1,92 @@
+import re
+
+from django.db import connections
+
+# Таблица FTS5 с внешним содержимым создаётся миграцией 0012_post_search:
+# индекс хранит только токены, title и text читаются из blog_post.
+FTS_TABLE = 'blog_post_fts'
+# Заголовок весит больше текста; явный вызов bm25 быстрее
+# настройки rank у таблицы.
+RANK = f'bm25({FTS_TABLE}, 10.0, 1.0)'
+# Триггеры ловят и bulk_create, и update(); пересчёт счётчиков
+# комментариев индекс не трогает — срабатывают только title и text.
+TRIGGERS = (
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert "
+    f"AFTER INSERT ON blog_post BEGIN "
+    f"INSERT INTO {FTS_TABLE} (rowid, title, text) "
+    f"VALUES (new.id, new.title, new.text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete "
+    f"AFTER DELETE ON blog_post BEGIN "
+    f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, title, text) "
+    f"VALUES ('delete', old.id, old.title, old.text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update "
+    f"AFTER UPDATE OF title, text ON blog_post "
+    f"WHEN old.title IS NOT new.title OR old.text IS NOT new.text BEGIN "
+    f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, title, text) "
+    f"VALUES ('delete', old.id, old.title, old.text); "
+    f"INSERT INTO {FTS_TABLE} (rowid, title, text) "
+    f"VALUES (new.id, new.title, new.text); END",
+)
+WORD = re.compile(r'\w+')
+
+
+def is_available(connection):
+    return (
+        connection.vendor == 'sqlite'
+        and FTS_TABLE in connection.introspection.table_names()
+    )
+
+
+def install_triggers(using):
+    """
+    Django пересоздаёт таблицу SQLite при изменении схемы и теряет
+    триггеры, поэтому они ставятся заново после каждого migrate.
+    """
+    connection = connections[using]
+    if not is_available(connection):
+        return
+    with connection.cursor() as cursor:
+        for sql in TRIGGERS:
+            cursor.execute(sql)
+
+
+def rebuild_index(using):
+    """Перестраивает индекс по blog_post целиком и сжимает его."""
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')"
+        )
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')"
+        )
+
+
+def matching(queryset, text):
+    """
+    Посты queryset, подходящие под text, от самых релевантных.
+    FTS-таблица присоединяется к запросу по rowid, поэтому условия
+    видимости, ранжирование и LIMIT/OFFSET страницы выполняются
+    одним SQL-запросом, без предварительной отсечки кандидатов.
+    """
+    query = match_query(text)
+    if not query:
+        return queryset.none()
+    post_table = queryset.model._meta.db_table
+    return queryset.extra(
+        select={'rank': RANK},
+        tables=[FTS_TABLE],
+        where=[
+            f'{FTS_TABLE}.rowid = {post_table}.id',
+            f'{FTS_TABLE} MATCH %s',
+        ],
+        params=[query],
+    ).order_by('rank', '-id')
+
+
+def match_query(text):
+    """
+    Пользовательский ввод в безопасный запрос FTS5: каждое слово
+    в кавычках и с поиском по началу (морфологии unicode61 не знает),
+    все слова обязательны.
+    """
+    return ' '.join(f'"{word}"*' for word in WORD.findall(text.lower()))
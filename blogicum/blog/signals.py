@@ -0,0 +1,120 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from blog import autocomplete, deletion, images, search
+from blog.cache import bump_page_cache_version
+from blog.constants import PROFILE_FIELDS
+from blog.models import Category, Comment, Location, Post, User
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, **kwargs):
+    """
+    Увеличивает счётчик комментариев поста при создании комментария,
+    а если комментарий перенесли к другому посту (в админке) —
+    переносит единицу счётчика со старого поста на новый.
+    Правка комментария тоже меняет updated_at поста,
+    от которого считаются ETag и Last-Modified.
+    """
+    now = timezone.now()
+    changes = {'updated_at': now}
+    moved_from = instance.loaded_post_id
+    moved = not created and moved_from not in (None, instance.post_id)
+    if created or moved:
+        changes['comment_count'] = F('comment_count') + 1
+    if moved:
+        Post.objects.filter(
+            pk=moved_from, comment_count__gt=0
+        ).update(comment_count=F('comment_count') - 1, updated_at=now)
+    Post.objects.filter(pk=instance.post_id).update(**changes)
+    instance.loaded_post_id = instance.post_id
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    """Уменьшает счётчик комментариев поста при удалении комментария."""
+    Post.objects.filter(
+        pk=instance.post_id, comment_count__gt=0
+    ).update(
+        comment_count=F('comment_count') - 1,
+        updated_at=timezone.now()
+    )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_page_cache(sender, **kwargs):
+    """Любая правка контента сбрасывает кеш страниц для гостей."""
+    bump_page_cache_version()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_profile_pages(sender, update_fields=None, **kwargs):
+    """
+    Имя автора видно в карточках, а шапка профиля — в его странице;
+    частичные сохранения вроде last_login при входе кеш не трогают.
+    """
+    if update_fields is not None and not (
+        set(PROFILE_FIELDS) & set(update_fields)
+    ):
+        return
+    bump_page_cache_version()
+
+
+@receiver(post_save, sender=User)
+def cancel_user_deletion(sender, instance, created, update_fields=None,
+                         **kwargs):
+    """Учётную запись включили до фоновой очистки — удаление отменено."""
+    if not created and instance.is_active and (
+        update_fields is None or 'is_active' in update_fields
+    ):
+        deletion.restore_user(instance)
+
+
+@receiver(post_migrate)
+def install_search_triggers(sender, using, **kwargs):
+    """Триггеры полнотекстового индекса после каждого migrate."""
+    if sender.name == 'blog':
+        search.install_triggers(using)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=User)
+def refresh_autocomplete(sender, instance, update_fields=None, **kwargs):
+    """
+    Подсказки объекта пересобираются при сохранении, кроме частичных
+    сохранений без подписи (например, last_login при входе).
+    """
+    if update_fields is not None and not (
+        {'title', 'username'} & set(update_fields)
+    ):
+        return
+    autocomplete.refresh_entries(instance)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=User)
+def forget_autocomplete(sender, **kwargs):
+    """Строки подсказок удалены каскадом, остаётся сбросить LRU."""
+    autocomplete.bump_autocomplete_version()
+
+
+@receiver(post_save, sender=Post)
+def schedule_image_variants(sender, instance, update_fields=None, **kwargs):
+    """Новая картинка поста — фоновая нарезка WebP-копий."""
+    if update_fields is not None and 'image' not in update_fields:
+        return
+    if (instance.image
+            and instance.image_variants.get('name') != instance.image.name):
+        images.schedule_variants(instance)
@@ -0,0 +1,62 @@
+import json
+
+READ_CHUNK_SIZE = 1 << 16
+WHITESPACE = ' \t\r\n'
+
+
+class JsonArrayReader:
+    """Буфер поверх файла: читает кусками и сдвигает прочитанное."""
+
+    def __init__(self, stream, chunk_size):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer, self.position, self.eof = '', 0, False
+
+    def fill(self):
+        chunk = self.stream.read(self.chunk_size)
+        self.eof = not chunk
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+
+    def peek(self, skip):
+        """Следующий значащий символ; пустая строка — конец файла."""
+        while True:
+            while (self.position < len(self.buffer)
+                   and self.buffer[self.position] in skip):
+                self.position += 1
+            if self.position < len(self.buffer) or self.eof:
+                return self.buffer[self.position:self.position + 1]
+            self.fill()
+
+    def decode(self, decoder):
+        """Разбирает элемент, дочитывая файл, пока он не поместится."""
+        while True:
+            try:
+                item, self.position = decoder.raw_decode(
+                    self.buffer, self.position
+                )
+                return item
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self.fill()
+
+
+def iter_json_array(stream, chunk_size=READ_CHUNK_SIZE):
+    """
+    Отдаёт элементы JSON-массива верхнего уровня по одному,
+    читая файл кусками: в памяти только текущий элемент и буфер.
+    Подходит для дампов dumpdata, где элементы — объекты.
+    """
+    decoder = json.JSONDecoder()
+    reader = JsonArrayReader(stream, chunk_size)
+    if reader.peek(WHITESPACE) != '[':
+        raise ValueError('Ожидался JSON-массив.')
+    reader.position += 1
+    while True:
+        char = reader.peek(WHITESPACE + ',')
+        if not char:
+            raise ValueError('Неожиданный конец JSON-массива.')
+        if char == ']':
+            return
+        yield reader.decode(decoder)
@@ -6,6 +6,12 @@ app_name = 'blog'
 
 urlpatterns = [
     path('', views.PostListView.as_view(), name='index'),
+    # полнотекстовый поиск
+    path('search/', views.PostSearchView.as_view(), name='search'),
+    # подсказки при наборе запроса
+    path('search/autocomplete/',
+         views.AutocompleteView.as_view(),
+         name='autocomplete'),
     # создание поста
     path('posts/create/',
          views.PostCreateView.as_view(),
@@ -22,6 +28,10 @@ urlpatterns = [
     path('posts/<int:post_id>/delete/',
          views.PostDeleteView.as_view(),
          name='delete_post'),
+    # Следующая порция комментариев
+    path('posts/<int:post_id>/comments/',
+         views.CommentListView.as_view(),
+         name='comments'),
     # Добавление коментария
     path('posts/<int:post_id>/comment/',
          views.CommentCreateView.as_view(),
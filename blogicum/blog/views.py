@@ -1,15 +1,46 @@
+import hashlib
+from datetime import datetime
+
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import Http404, JsonResponse
+from django.middleware.csrf import get_token
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse_lazy
+from django.utils.cache import get_conditional_response
+from django.utils.http import (http_date, parse_http_date_safe, quote_etag,
+                               urlencode)
+from django.utils.timezone import utc
 from django.views.generic import (CreateView, DeleteView, DetailView, ListView,
-                                  UpdateView)
+                                  UpdateView, View)
 
+from blog import autocomplete, cache
+from blog.deletion import soft_delete_post
 from blog.forms import CommentForm, PostForm, UserForm
-from blog.models import Category, Comment, Post, PostQuerySet, User
-from .constants import PAGINATE_BY
+from blog.models import (Category, Comment, Post, PostQuerySet, User,
+                         publication_now, publication_visible_at)
+from blog.paginators import InvalidCursor, KeysetPaginator
+from .constants import COMMENTS_PAGINATE_BY, PAGINATE_BY
+
+
+class CachedObjectMixin():
+    """
+    Загружает редактируемый объект один раз за запрос:
+    dispatch, get/post и get_context_data получают одну и ту же строку.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('author')
+
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if getattr(self, '_cached_object', None) is None:
+            self._cached_object = super().get_object()
+        return self._cached_object
 
 
-class AuthorRequiredMixin():
+class AuthorRequiredMixin(CachedObjectMixin):
 
     def dispatch(self, request, *args, **kwargs):
         if (request.user == self.get_object().author):
@@ -22,24 +53,192 @@ class RelatedPostsViewMixin():
 
     def get_queryset(self):
         """Список постов автора или категории."""
-        self.object = self.get_object()
-        return PostQuerySet.add_comments(PostQuerySet.add_filter(
+        if getattr(self, 'object', None) is None:
+            self.object = self.get_object()
+        return PostQuerySet.for_cards(PostQuerySet.add_filter(
             self.get_user_id(), self.object.posts
         ))
 
+    def get_validators(self):
+        parts, last_modified = list_validators(self.get_queryset())
+        object_parts, object_modified = self.get_object_validators()
+        if object_modified and object_modified > last_modified:
+            last_modified = object_modified
+        return parts + object_parts, last_modified
+
+
+def generation_time(version):
+    """Момент смены поколения кеша страниц (оно в наносекундах)."""
+    return datetime.fromtimestamp(version / 10 ** 9, tz=utc)
+
+
+def list_validators(queryset):
+    """
+    ETag-части и Last-Modified списка постов без обхода ленты.
+    Поколение кеша страниц меняется при любой правке контента
+    (посты, комментарии, категории, места, профили авторов),
+    в том числе при удалении и снятии с публикации. Отложенные
+    посты появляются без сигналов — их ловит момент появления
+    самой свежей видимой публикации списка (один запрос с LIMIT 1).
+    """
+    version = cache.get_page_cache_version()
+    last_modified = generation_time(version)
+    newest = queryset.filter(
+        pub_date__lt=publication_now()
+    ).order_by('-pub_date').values_list('pub_date', flat=True).first()
+    if newest is not None:
+        last_modified = max(last_modified, publication_visible_at(newest))
+    return (version, newest), last_modified
+
+
+class ConditionalGetMixin():
+    """
+    Отвечает 304 Not Modified по ETag/Last-Modified,
+    не выполняя основной запрос и рендер страницы.
+    """
+
+    # Страница выводит вошедшему пользователю форму с CSRF-токеном.
+    # Токен меняется при входе, поэтому cookie с ним входит в ETag,
+    # а Last-Modified не раньше last_login: иначе после повторного
+    # входа браузер получит 304 и отправит форму со старым токеном.
+    renders_form = False
+
+    def get_validators(self):
+        """Части ETag и время изменения; (None, None) — без проверки."""
+        return None, None
+
+    def get(self, request, *args, **kwargs):
+        parts, last_modified = self.get_validators()
+        if parts is None:
+            return super().get(request, *args, **kwargs)
+        parts = (request.get_full_path(), request.user.pk, *parts)
+        if self.renders_form and request.user.is_authenticated:
+            get_token(request)
+            parts += (request.META['CSRF_COOKIE'],)
+            last_login = request.user.last_login
+            if last_login and last_login > last_modified:
+                last_modified = last_login
+        etag = quote_etag(hashlib.md5(repr(parts).encode()).hexdigest())
+        timestamp = last_modified and int(last_modified.timestamp())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp
+        )
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response.headers.setdefault('ETag', etag)
+            if timestamp:
+                response.headers.setdefault(
+                    'Last-Modified', http_date(timestamp)
+                )
+        return response
+
+
+class AnonymousPageCacheMixin():
+    """Отдаёт неавторизованным читателям страницу из кеша."""
+
+    def dispatch(self, request, *args, **kwargs):
+        if not cache.is_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+        key = cache.make_page_cache_key(request)
+        response = cache.get_cache().get(key)
+        if response is not None:
+            return get_conditional_response(
+                request,
+                etag=response.get('ETag'),
+                last_modified=parse_http_date_safe(
+                    response.get('Last-Modified')
+                ),
+                response=response,
+            )
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200 and hasattr(response, 'render'):
+            response.add_post_render_callback(
+                lambda rendered: cache.store_page(key, rendered)
+            )
+        return response
+
+
+class KeysetPaginationMixin():
+    """
+    Пагинация по курсору (pub_date, id) вместо OFFSET.
+    Включается настройкой BLOG_PAGINATION_MODE = 'keyset'
+    или параметром ?cursor= в запросе.
+    """
+
+    cursor_kwarg = 'cursor'
+    keyset_ordering = ('-pub_date', '-id')
+
+    def use_keyset(self):
+        return (
+            self.cursor_kwarg in self.request.GET
+            or settings.BLOG_PAGINATION_MODE == 'keyset'
+        )
+
+    def get_keyset_paginator(self, queryset, page_size):
+        return KeysetPaginator(queryset, page_size, self.keyset_ordering)
 
-class PostListView(ListView):
+    def paginate_queryset(self, queryset, page_size):
+        if not self.use_keyset():
+            return super().paginate_queryset(queryset, page_size)
+        paginator = self.get_keyset_paginator(queryset, page_size)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor:
+            raise Http404('Неверный курсор страницы.')
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class PostListView(AnonymousPageCacheMixin, ConditionalGetMixin,
+                   KeysetPaginationMixin, ListView):
     """Просмотр главной страницы."""
 
+    use_replica = True
     ordering = ('-pub_date',)
     paginate_by = PAGINATE_BY
     template_name = 'blog/index.html'
 
     def get_queryset(self):
-        """Список постов автора."""
-        return PostQuerySet.add_filter(
-            None,
-            PostQuerySet.add_comments(Post.objects)
+        """Лента: только колонки, нужные карточкам постов."""
+        return PostQuerySet.for_cards(
+            PostQuerySet.add_filter(None, Post.objects)
+        )
+
+    def get_validators(self):
+        return list_validators(self.get_queryset())
+
+
+class PostSearchView(ListView):
+    """Полнотекстовый поиск по заголовкам и текстам постов."""
+
+    use_replica = True
+    paginate_by = PAGINATE_BY
+    template_name = 'blog/search.html'
+
+    def get_query(self):
+        return self.request.GET.get('q', '').strip()
+
+    def get_queryset(self):
+        return PostQuerySet.for_cards(PostQuerySet.search(
+            PostQuerySet.add_filter(self.request.user.id, Post.objects),
+            self.get_query(),
+        ))
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.get_query()
+        context['pagination_query'] = urlencode({'q': context['query']})
+        return context
+
+
+class AutocompleteView(View):
+    """Подсказки по началу заголовка, категории или имени — JSON."""
+
+    use_replica = True
+
+    def get(self, request):
+        return JsonResponse(
+            {'results': autocomplete.suggest(request.GET.get('q', ''))}
         )
 
 
@@ -62,9 +261,11 @@ class PostCreateView(LoginRequiredMixin, CreateView):
         return super().form_valid(form)
 
 
-class PostDetailView(DetailView):
+class PostDetailView(ConditionalGetMixin, DetailView):
     """Просмотр отдельного поста."""
 
+    use_replica = True
+    renders_form = True
     model = Post
 
     template_name = 'blog/detail.html'
@@ -76,19 +277,72 @@ class PostDetailView(DetailView):
             super().get_queryset()
         )
 
+    def get_validators(self):
+        """
+        Пост, его категория и место; комментарии обновляют пост.
+        Имена комментаторов меняются без правки поста, но сбрасывают
+        поколение кеша страниц — оно тоже входит в валидаторы.
+        """
+        version = cache.get_page_cache_version()
+        row = self.get_queryset().filter(
+            pk=self.kwargs[self.pk_url_kwarg]
+        ).values_list(
+            'updated_at',
+            'category__updated_at',
+            'location__updated_at',
+            'author__username',
+        ).first()
+        if row is None:
+            return None, None
+        stamps = [stamp for stamp in row[:3] if stamp is not None]
+        return (version, row), max(stamps + [generation_time(version)])
+
     def get_context_data(self, **kwargs):
         """Передача формы для написания комментария."""
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = (
-            self.object.comments
-            .select_related('author')
-            .order_by('created_at')
+        context['comments'] = paginate_comments(
+            self.object, self.request.GET.get('comments')
         )
         return context
 
 
-class PostUpdateView(LoginRequiredMixin, UpdateView):
+def paginate_comments(post, cursor):
+    """Порция комментариев поста от старых к новым, по курсору."""
+    paginator = KeysetPaginator(
+        post.comments.select_related('author'),
+        COMMENTS_PAGINATE_BY,
+        ('created_at', 'id'),
+    )
+    try:
+        return paginator.page(cursor)
+    except InvalidCursor:
+        raise Http404('Неверный курсор комментариев.')
+
+
+class CommentListView(DetailView):
+    """Следующая порция комментариев поста HTML-фрагментом."""
+
+    use_replica = True
+    model = Post
+    template_name = 'includes/comment_list.html'
+    pk_url_kwarg = 'post_id'
+
+    def get_queryset(self):
+        return PostQuerySet.add_filter(
+            self.request.user.id,
+            super().get_queryset()
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['comments'] = paginate_comments(
+            self.object, self.request.GET.get('cursor')
+        )
+        return context
+
+
+class PostUpdateView(CachedObjectMixin, LoginRequiredMixin, UpdateView):
     """Редактирование поста."""
 
     model = Post
@@ -121,9 +375,15 @@ class PostDeleteView(LoginRequiredMixin, AuthorRequiredMixin, DeleteView):
     def get_context_data(self, **kwargs):
         """заполняется форма которую удаляем."""
         context = super().get_context_data(**kwargs)
-        context['form'] = self.form_class(instance=self.get_object())
+        context['form'] = self.form_class(instance=self.object)
         return context
 
+    def delete(self, request, *args, **kwargs):
+        """Пост скрывается сразу, комментарии удалит фоновая задача."""
+        self.object = self.get_object()
+        soft_delete_post(self.object)
+        return redirect(self.get_success_url())
+
 
 class CommentCreateView(LoginRequiredMixin, CreateView):
     """Создание комментария."""
@@ -186,9 +446,11 @@ class UserUpdateView(LoginRequiredMixin, UpdateView):
         return self.request.user
 
 
-class UserDetailView(RelatedPostsViewMixin, ListView):
+class UserDetailView(RelatedPostsViewMixin, AnonymousPageCacheMixin,
+                     ConditionalGetMixin, KeysetPaginationMixin, ListView):
     """Просмотр страницы пользователя."""
 
+    use_replica = True
     template_name = 'blog/profile.html'
     paginate_by = PAGINATE_BY
 
@@ -200,6 +462,13 @@ class UserDetailView(RelatedPostsViewMixin, ListView):
     def get_user_id(self):
         return self.request.user.id
 
+    def get_object_validators(self):
+        """Шапка профиля: у User нет updated_at, сравниваем сами поля."""
+        profile = self.object
+        return (
+            profile.username, profile.get_full_name(), profile.is_staff
+        ), None
+
     def get_context_data(self, **kwargs):
         """Получаем словарь контекста."""
         context = super().get_context_data(**kwargs)
@@ -207,15 +476,24 @@ class UserDetailView(RelatedPostsViewMixin, ListView):
         return context
 
 
-class CategoryDetailView(RelatedPostsViewMixin, LoginRequiredMixin, ListView):
-    """Просмотр страницы категории."""
+class CategoryDetailView(RelatedPostsViewMixin, LoginRequiredMixin,
+                         ConditionalGetMixin, KeysetPaginationMixin,
+                         ListView):
+    """
+    Просмотр страницы категории. Страница только для вошедших,
+    поэтому кеш страниц для гостей к ней не применяется.
+    """
 
+    use_replica = True
     template_name = 'blog/category.html'
     paginate_by = PAGINATE_BY
 
     def get_user_id(self):
         return None
 
+    def get_object_validators(self):
+        return (self.object.updated_at,), self.object.updated_at
+
     def get_object(self):
         return get_object_or_404(
             Category,
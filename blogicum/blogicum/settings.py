@@ -3,7 +3,13 @@ from pathlib import Path
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# Письма копятся в очереди и уходят из воркера run_jobs пачками
+# через EMAIL_DELIVERY_BACKEND (локально — файлы в sent_emails/).
+EMAIL_BACKEND = 'core.mail.QueuedEmailBackend'
+EMAIL_DELIVERY_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+EMAIL_BATCH_SIZE = 50
+EMAIL_CLAIM_TIMEOUT = 300
+EMAIL_SENT_RETENTION = 60 * 60 * 24
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 # Quick-start development settings - unsuitable for production
@@ -47,11 +53,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ReplicaMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'debug_toolbar.middleware.DebugToolbarMiddleware',
@@ -93,9 +101,44 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Соединение живёт между запросами, PRAGMA выполняются один раз.
+        'CONN_MAX_AGE': 60,
+    },
+    # Копия основной базы для чтения; обновляется командой sync_replica.
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db-replica.sqlite3',
+        'CONN_MAX_AGE': 60,
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+# Применяются к каждому новому SQLite-соединению (core.db.configure_sqlite).
+# WAL не блокирует чтение во время записи, busy_timeout ждёт снятия
+# блокировки вместо немедленного «database is locked».
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -20000,
+    'mmap_size': 128 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blogicum',
     }
 }
 
+# Кеш страниц ленты, профиля и категории для неавторизованных читателей
+BLOG_PAGE_CACHE_ALIAS = 'default'
+BLOG_PAGE_CACHE_TIMEOUT = 60 * 5
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -141,6 +184,59 @@ STATICFILES_DIRS = [
 
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Имена загрузок — хеш содержимого: дубликаты хранятся один раз,
+# сироты убирает gc_media
+DEFAULT_FILE_STORAGE = 'core.storage.ContentAddressedStorage'
+
+
+# Пагинация лент: 'offset' — номера страниц, 'keyset' — курсоры без COUNT
+BLOG_PAGINATION_MODE = 'offset'
+
+# Шаг «часов публикации» в секундах: отложенные посты появляются
+# на границе интервала, а SQL ленты не меняется внутри него
+BLOG_PUBLICATION_CLOCK_GRANULARITY = 60
+# Псевдоним реплики для читающих страниц (None — читать из основной базы).
+# Включайте после первого запуска sync_replica и повторяйте его по расписанию.
+BLOG_READ_REPLICA = None
+BLOG_REPLICA_PIN_COOKIE = 'primary_pin'
+BLOG_REPLICA_PIN_SECONDS = 60
+
+# Очередь фоновых задач core.jobs в той же базе; воркер — run_jobs.
+# JOBS_EAGER выполняет задачи сразу после коммита, без воркера.
+JOBS_EAGER = False
+JOBS_WORKERS = 4
+JOBS_VISIBILITY_TIMEOUT = 300
+JOBS_MAX_ATTEMPTS = 3
+JOBS_RETRY_DELAY = 30
+JOBS_POLL_INTERVAL = 1.0
+
+# Замеры запроса (SQL, шаблоны, кеш) в Server-Timing и журнал
+# core.performance; снимается доля запросов, остальные не обёрнуты.
+# Накладные расходы меряет команда bench_perf.
+PERF_SAMPLE_RATE = 0.01
+# Кому отдавать заголовок Server-Timing: 'staff', 'all' или None
+PERF_SERVER_TIMING = 'staff'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'message': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'performance': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'message',
+        },
+    },
+    'loggers': {
+        'core.performance': {
+            'handlers': ['performance'],
+            'level': 'INFO',
+        },
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
 
@@ -0,0 +1,49 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import Job, OutgoingEmail
+
+
+@admin.action(description='Повторить выбранные задачи')
+def retry_jobs(modeladmin, request, queryset):
+    queryset.update(
+        status=Job.QUEUED, attempts=0, run_at=timezone.now(),
+        locked_by='', locked_until=None,
+    )
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        'name',
+        'status',
+        'attempts',
+        'run_at',
+        'locked_by',
+        'created_at',
+    )
+    list_filter = (
+        'status',
+        'name',
+    )
+    readonly_fields = (
+        'last_error',
+    )
+    actions = (
+        retry_jobs,
+    )
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        '__str__',
+        'created_at',
+        'sent_at',
+    )
+    list_filter = (
+        ('sent_at', admin.EmptyFieldListFilter),
+    )
+    exclude = (
+        'message',
+    )
@@ -1,6 +1,20 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.conf import settings
+        from django.utils.module_loading import import_string
+
+        from .db import configure_sqlite
+        from .perf import instrument_cache_backend
+
+        connection_created.connect(
+            configure_sqlite, dispatch_uid='core.configure_sqlite'
+        )
+        for config in settings.CACHES.values():
+            instrument_cache_backend(import_string(config['BACKEND']))
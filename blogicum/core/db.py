@@ -0,0 +1,28 @@
+from django.conf import settings
+
+PRAGMA_NAMES = frozenset((
+    'journal_mode', 'synchronous', 'busy_timeout', 'cache_size',
+    'mmap_size', 'temp_store', 'foreign_keys', 'wal_autocheckpoint',
+))
+
+
+def apply_pragmas(cursor, pragmas):
+    """Выполняет PRAGMA name = value для каждой пары из словаря."""
+    for name, value in pragmas.items():
+        if name not in PRAGMA_NAMES:
+            raise ValueError(f'Неизвестная PRAGMA: {name}')
+        if not str(value).lstrip('-').isalnum():
+            raise ValueError(f'Недопустимое значение PRAGMA {name}: {value}')
+        cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """
+    Обработчик connection_created: настраивает каждое новое
+    SQLite-соединение профилем из settings.SQLITE_PRAGMAS.
+    При CONN_MAX_AGE > 0 это происходит раз на соединение, а не на запрос.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        apply_pragmas(cursor, getattr(settings, 'SQLITE_PRAGMAS', {}))
@@ -0,0 +1,131 @@
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+CLAIM_CANDIDATES_FACTOR = 2
+
+
+class NotAJob(ValueError):
+    """Имя в очереди не указывает на функцию с декоратором @job."""
+
+
+def job(function=None, *, max_attempts=None):
+    """
+    Помечает функцию как фоновую задачу: её можно передать в enqueue.
+    Аргументы задачи должны сериализоваться в JSON.
+    """
+    def decorate(function):
+        function.job_name = f'{function.__module__}.{function.__qualname__}'
+        function.max_attempts = max_attempts
+        return function
+
+    return decorate(function) if function else decorate
+
+
+def resolve(name):
+    function = import_string(name)
+    if getattr(function, 'job_name', None) != name:
+        raise NotAJob(name)
+    return function
+
+
+def enqueue(function, *args, delay=None, **kwargs):
+    """
+    Ставит задачу в очередь в текущей транзакции: воркер увидит её
+    только после коммита, а при откате она исчезнет вместе с данными.
+    С JOBS_EAGER задача выполняется сразу после коммита, без воркера.
+    """
+    if getattr(function, 'job_name', None) is None:
+        raise NotAJob(repr(function))
+    if settings.JOBS_EAGER:
+        transaction.on_commit(lambda: function(*args, **kwargs))
+        return None
+    return Job.objects.create(
+        name=function.job_name,
+        args=list(args),
+        kwargs=kwargs,
+        max_attempts=function.max_attempts or settings.JOBS_MAX_ATTEMPTS,
+        run_at=timezone.now() + (delay or timedelta()),
+    )
+
+
+def claimable(now):
+    """Готовые к запуску задачи и задачи упавших воркеров."""
+    return (
+        Q(status=Job.QUEUED, run_at__lte=now)
+        | Q(status=Job.RUNNING, locked_until__lt=now)
+    )
+
+
+def claim(limit, worker, visibility_timeout):
+    """
+    Забирает до limit задач. Каждая строка захватывается отдельным
+    условным UPDATE: из нескольких воркеров его выполнит только один,
+    поэтому блокировки строк (SELECT … FOR UPDATE) не нужны.
+    Задача, не завершённая за visibility_timeout секунд, снова
+    становится доступной — так переживается падение воркера.
+    """
+    if limit <= 0:
+        return []
+    now = timezone.now()
+    Job.objects.filter(
+        status=Job.RUNNING, locked_until__lt=now,
+        attempts__gte=F('max_attempts'),
+    ).update(status=Job.FAILED, last_error='Истёк таймаут видимости.')
+    candidates = Job.objects.filter(claimable(now)).values_list(
+        'pk', flat=True
+    )[:limit * CLAIM_CANDIDATES_FACTOR]
+    claimed = []
+    for pk in candidates:
+        if len(claimed) == limit:
+            break
+        if Job.objects.filter(claimable(now), pk=pk).update(
+            status=Job.RUNNING,
+            attempts=F('attempts') + 1,
+            locked_by=worker,
+            locked_until=now + timedelta(seconds=visibility_timeout),
+        ):
+            claimed.append(pk)
+    return list(Job.objects.filter(pk__in=claimed))
+
+
+def execute(name, args, kwargs):
+    """Запускается в потоке или процессе пула воркера."""
+    try:
+        resolve(name)(*args, **kwargs)
+    finally:
+        connections.close_all()
+
+
+def complete(job, worker):
+    """Успешная задача удаляется; упавшие остаются в таблице."""
+    Job.objects.filter(pk=job.pk, locked_by=worker).delete()
+
+
+def fail(job, worker, error):
+    """
+    Повтор с экспоненциальной паузой, пока есть попытки;
+    потом задача остаётся со статусом FAILED и текстом ошибки.
+    """
+    message = ''.join(traceback.format_exception(
+        type(error), error, error.__traceback__
+    ))
+    if job.attempts < job.max_attempts:
+        changes = {
+            'status': Job.QUEUED,
+            'run_at': timezone.now() + timedelta(
+                seconds=settings.JOBS_RETRY_DELAY * 2 ** (job.attempts - 1)
+            ),
+        }
+    else:
+        changes = {'status': Job.FAILED}
+    Job.objects.filter(pk=job.pk, locked_by=worker).update(
+        locked_by='', locked_until=None, last_error=message, **changes
+    )
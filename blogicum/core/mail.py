@@ -0,0 +1,152 @@
+import math
+import uuid
+from datetime import timedelta
+from email import message_from_bytes
+from email.message import Message
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.mail.message import MIMEMixin
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from .jobs import enqueue, job
+from .models import Job, OutgoingEmail
+
+
+class QueuedMIME(MIMEMixin, Message):
+    """Разобранное письмо с тем же as_bytes(linesep=…), что у SafeMIME*."""
+
+
+class QueuedMessage(EmailMessage):
+    """Письмо из очереди: транспорту отдаются сохранённые байты как есть."""
+
+    def __init__(self, email):
+        super().__init__(from_email=email.sender, to=email.recipients)
+        self.raw = bytes(email.message)
+
+    def message(self):
+        return message_from_bytes(self.raw, _class=QueuedMIME)
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """
+    Сохраняет письма в таблицу и сразу возвращает управление: запрос
+    не ждёт ни SMTP, ни диска. Доставляет их задача deliver_outbox.
+    """
+
+    def send_messages(self, email_messages):
+        emails = [
+            OutgoingEmail(
+                sender=message.from_email,
+                recipients=message.recipients(),
+                message=message.message().as_bytes(),
+            )
+            for message in email_messages
+            if message.recipients()
+        ]
+        if not emails:
+            return 0
+        OutgoingEmail.objects.bulk_create(emails)
+        # Ждущая задача заберёт и эти письма: вторая не нужна.
+        if not Job.objects.filter(
+            name=deliver_outbox.job_name, status=Job.QUEUED
+        ).exists():
+            enqueue(deliver_outbox)
+        return len(emails)
+
+
+def claim_emails(worker):
+    """Пачка неотправленных писем, которую не взял другой воркер."""
+    now = timezone.now()
+    claimable = Q(sent_at__isnull=True) & (
+        Q(claimed_until__isnull=True) | Q(claimed_until__lt=now)
+    )
+    ids = list(
+        OutgoingEmail.objects.filter(claimable).order_by('created_at')
+        .values_list('pk', flat=True)[:settings.EMAIL_BATCH_SIZE]
+    )
+    OutgoingEmail.objects.filter(claimable, pk__in=ids).update(
+        claimed_by=worker,
+        claimed_until=now + timedelta(seconds=settings.EMAIL_CLAIM_TIMEOUT),
+    )
+    return list(OutgoingEmail.objects.filter(
+        pk__in=ids, claimed_by=worker, sent_at__isnull=True
+    ))
+
+
+class OutboxNotEmpty(Exception):
+    """В очереди остались письма, занятые другим воркером."""
+
+
+def release_claims(worker):
+    """Возвращает в очередь неотправленные письма воркера."""
+    OutgoingEmail.objects.filter(
+        claimed_by=worker, sent_at__isnull=True
+    ).update(claimed_by='', claimed_until=None)
+
+
+@job
+def deliver_outbox():
+    """
+    Отправляет очередь пачками по EMAIL_BATCH_SIZE через одно
+    соединение EMAIL_DELIVERY_BACKEND на весь запуск. Каждое письмо
+    помечается отправленным сразу после доставки; при ошибке
+    неотправленные письма освобождаются для повторной попытки задачи.
+    Задача успешна, только если очередь опустела.
+    """
+    worker = uuid.uuid4().hex
+    try:
+        with get_connection(settings.EMAIL_DELIVERY_BACKEND) as connection:
+            while True:
+                emails = claim_emails(worker)
+                if not emails:
+                    break
+                for email in emails:
+                    connection.send_messages([QueuedMessage(email)])
+                    OutgoingEmail.objects.filter(
+                        pk=email.pk, claimed_by=worker
+                    ).update(sent_at=timezone.now(), claimed_until=None)
+    except Exception:
+        release_claims(worker)
+        raise
+    OutgoingEmail.objects.filter(
+        sent_at__lt=timezone.now()
+        - timedelta(seconds=settings.EMAIL_SENT_RETENTION)
+    ).delete()
+    if OutgoingEmail.objects.filter(sent_at__isnull=True).exists():
+        raise OutboxNotEmpty('Письма заняты другим воркером.')
+
+
+def percentile(values, share):
+    """Процентиль отсортированного списка, ближайший ранг."""
+    if not values:
+        return None
+    return values[max(0, math.ceil(share / 100 * len(values)) - 1)]
+
+
+def outbox_stats(window=timedelta(hours=1)):
+    """
+    Глубина очереди, возраст самого старого письма и задержка
+    доставки (от постановки в очередь до отправки) за window.
+    """
+    now = timezone.now()
+    pending = OutgoingEmail.objects.filter(sent_at__isnull=True)
+    oldest = pending.aggregate(oldest=Min('created_at'))['oldest']
+    latencies = sorted(
+        (sent_at - created_at).total_seconds()
+        for created_at, sent_at in OutgoingEmail.objects.filter(
+            sent_at__gte=now - window
+        ).values_list('created_at', 'sent_at')
+    )
+    return {
+        'queue_depth': pending.count(),
+        'oldest_pending_seconds': (
+            (now - oldest).total_seconds() if oldest else 0
+        ),
+        'sent': len(latencies),
+        'latency_p50_seconds': percentile(latencies, 50),
+        'latency_p95_seconds': percentile(latencies, 95),
+        'latency_max_seconds': latencies[-1] if latencies else None,
+    }
@@ -0,0 +1,69 @@
+import logging
+import statistics
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+
+
+class Command(BaseCommand):
+    help = (
+        'Меряет накладные расходы PerformanceMiddleware: среднее время '
+        'запроса без замеров, с рабочей долей PERF_SAMPLE_RATE и с замером '
+        'каждого запроса.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='/')
+        parser.add_argument(
+            '--requests', type=int, default=200,
+            help='Запросов в одном раунде профиля.')
+        parser.add_argument(
+            '--rounds', type=int, default=5,
+            help='Раундов; профили чередуются, берётся медиана.')
+
+    def handle(self, *args, **options):
+        host = settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else None
+        client = Client(HTTP_HOST=host or 'localhost')
+        url = options['url']
+        profiles = (
+            ('off', 0),
+            ('sampled', settings.PERF_SAMPLE_RATE),
+            ('always', 1),
+        )
+        timings = {name: [] for name, _ in profiles}
+        # Строка журнала собирается, но не печатается: меряем
+        # middleware, а не консоль.
+        logger = logging.getLogger('core.performance')
+        handlers, propagate = logger.handlers, logger.propagate
+        logger.handlers, logger.propagate = [logging.NullHandler()], False
+        try:
+            with override_settings(DEBUG=False):
+                client.get(url)
+                for _ in range(options['rounds']):
+                    for name, rate in profiles:
+                        with override_settings(PERF_SAMPLE_RATE=rate):
+                            timings[name].append(
+                                self.measure(client, url, options['requests'])
+                            )
+        finally:
+            logger.handlers, logger.propagate = handlers, propagate
+        baseline = statistics.median(timings['off'])
+        self.stdout.write(
+            f'{"профиль":<10}{"доля":>8}{"мс/запрос":>12}{"издержки":>11}'
+        )
+        for name, rate in profiles:
+            mean = statistics.median(timings[name])
+            overhead = (mean - baseline) / baseline * 100 if baseline else 0
+            self.stdout.write(
+                f'{name:<10}{rate:>8.2f}{mean * 1000:>12.3f}'
+                f'{overhead:>10.1f}%'
+            )
+
+    @staticmethod
+    def measure(client, url, count):
+        started = perf_counter()
+        for _ in range(count):
+            client.get(url)
+        return (perf_counter() - started) / count
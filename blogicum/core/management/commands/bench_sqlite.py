@@ -0,0 +1,164 @@
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.db import apply_pragmas
+
+BENCH_POSTS = 5000
+FEED_SQL = (
+    'SELECT id, title, comment_count FROM post '
+    'WHERE id < ? ORDER BY id DESC LIMIT 10'
+)
+
+
+def percentile(values, share):
+    if not values:
+        return 0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+class Workload:
+    """
+    Нагрузка, похожая на блог: читатели листают ленту,
+    писатели добавляют комментарий и увеличивают счётчик поста.
+    """
+
+    def __init__(self, path, pragmas, reconnect):
+        self.path = path
+        self.pragmas = pragmas
+        self.reconnect = reconnect
+        self.stop = threading.Event()
+        self.lock = threading.Lock()
+        self.reads = self.writes = self.errors = 0
+        self.write_latencies = []
+
+    def connect(self):
+        connection = sqlite3.connect(
+            self.path, isolation_level=None, check_same_thread=False
+        )
+        apply_pragmas(connection.cursor(), self.pragmas)
+        return connection
+
+    def setup(self):
+        connection = self.connect()
+        connection.executescript(
+            'CREATE TABLE post (id INTEGER PRIMARY KEY, title TEXT, '
+            'comment_count INTEGER NOT NULL DEFAULT 0);'
+            'CREATE TABLE comment (id INTEGER PRIMARY KEY, '
+            'post_id INTEGER NOT NULL, text TEXT);'
+        )
+        connection.executemany(
+            'INSERT INTO post (id, title) VALUES (?, ?)',
+            ((i, f'Пост {i}') for i in range(1, BENCH_POSTS + 1)),
+        )
+        connection.close()
+
+    def run(self, operation):
+        connection = None if self.reconnect else self.connect()
+        number = 0
+        while not self.stop.is_set():
+            number += 1
+            current = connection or self.connect()
+            try:
+                operation(current, number)
+            except sqlite3.OperationalError:
+                with self.lock:
+                    self.errors += 1
+            finally:
+                if connection is None:
+                    current.close()
+        if connection is not None:
+            connection.close()
+
+    def read(self, connection, number):
+        connection.execute(
+            FEED_SQL, (BENCH_POSTS - number % BENCH_POSTS + 1,)
+        ).fetchall()
+        with self.lock:
+            self.reads += 1
+
+    def write(self, connection, number):
+        started = perf_counter()
+        post_id = number % BENCH_POSTS + 1
+        connection.execute('BEGIN')
+        try:
+            connection.execute(
+                'INSERT INTO comment (post_id, text) VALUES (?, ?)',
+                (post_id, 'Комментарий'),
+            )
+            connection.execute(
+                'UPDATE post SET comment_count = comment_count + 1 '
+                'WHERE id = ?', (post_id,),
+            )
+            connection.execute('COMMIT')
+        except sqlite3.OperationalError:
+            connection.execute('ROLLBACK')
+            raise
+        with self.lock:
+            self.writes += 1
+            self.write_latencies.append(perf_counter() - started)
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает пропускную способность SQLite с настройками '
+        'по умолчанию и с профилем SQLITE_PRAGMAS при параллельных '
+        'читателях и писателях.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument(
+            '--duration', type=float, default=3.0,
+            help='Секунд на каждый профиль.')
+        parser.add_argument(
+            '--reconnect', action='store_true',
+            help='Открывать соединение на каждую операцию (CONN_MAX_AGE=0).')
+
+    def handle(self, *args, **options):
+        profiles = (
+            ('default', {}),
+            ('tuned', getattr(settings, 'SQLITE_PRAGMAS', {})),
+        )
+        self.stdout.write(
+            f'{"профиль":<10}{"чтений/с":>12}{"записей/с":>12}'
+            f'{"p95 записи, мс":>16}{"ошибок":>9}'
+        )
+        for name, pragmas in profiles:
+            workload = self.measure(pragmas, options)
+            duration = options['duration']
+            self.stdout.write(
+                f'{name:<10}{workload.reads / duration:>12.0f}'
+                f'{workload.writes / duration:>12.0f}'
+                f'{percentile(workload.write_latencies, 0.95) * 1000:>16.1f}'
+                f'{workload.errors:>9}'
+            )
+
+    def measure(self, pragmas, options):
+        with tempfile.TemporaryDirectory() as directory:
+            workload = Workload(
+                str(Path(directory) / 'bench.sqlite3'), pragmas,
+                options['reconnect'],
+            )
+            workload.setup()
+            threads = [
+                threading.Thread(target=workload.run, args=(workload.read,))
+                for _ in range(options['readers'])
+            ] + [
+                threading.Thread(target=workload.run, args=(workload.write,))
+                for _ in range(options['writers'])
+            ]
+            for thread in threads:
+                thread.start()
+            workload.stop.wait(options['duration'])
+            workload.stop.set()
+            for thread in threads:
+                thread.join()
+        return workload
@@ -0,0 +1,21 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from core.mail import outbox_stats
+
+
+class Command(BaseCommand):
+    help = 'Глубина очереди писем и задержка их доставки.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--window', type=int, default=60,
+            help='За сколько минут считать задержку доставки.')
+
+    def handle(self, *args, **options):
+        stats = outbox_stats(timedelta(minutes=options['window']))
+        for name, value in stats.items():
+            if isinstance(value, float):
+                value = f'{value:.3f}'
+            self.stdout.write(f'{name}: {value}')
@@ -0,0 +1,105 @@
+import multiprocessing
+import os
+import socket
+import time
+import uuid
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core import jobs
+
+POOLS = ('thread', 'process')
+
+
+def make_pool(kind, workers):
+    if kind == 'process':
+        # Пул создаёт процессы при первом submit(), когда родитель уже
+        # открыл соединение с SQLite в jobs.claim(); через fork оно
+        # попало бы в потомков, а SQLite это запрещает. Поэтому spawn:
+        # потомок запускается с чистого интерпретатора и сам
+        # настраивает Django.
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=django.setup,
+        )
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job')
+
+
+class Command(BaseCommand):
+    help = (
+        'Воркер очереди фоновых задач: забирает задачи из таблицы '
+        'core_job и выполняет их пулом потоков или процессов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=settings.JOBS_WORKERS,
+            help='Сколько задач выполнять одновременно.')
+        parser.add_argument(
+            '--pool', choices=POOLS, default='thread',
+            help='process — для задач, упирающихся в процессор.')
+        parser.add_argument(
+            '--visibility-timeout', type=int,
+            default=settings.JOBS_VISIBILITY_TIMEOUT,
+            help='Через сколько секунд незавершённую задачу '
+                 'может забрать другой воркер.')
+        parser.add_argument(
+            '--poll-interval', type=float,
+            default=settings.JOBS_POLL_INTERVAL,
+            help='Пауза между опросами пустой очереди, с.')
+        parser.add_argument(
+            '--burst', action='store_true',
+            help='Выполнить всё, что готово, и выйти.')
+
+    def handle(self, *args, **options):
+        self.worker = (
+            f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        )
+        self.done = self.failed = 0
+        workers = options['workers']
+        with make_pool(options['pool'], workers) as pool:
+            running = {}
+            try:
+                while True:
+                    for job in jobs.claim(
+                        workers - len(running), self.worker,
+                        options['visibility_timeout'],
+                    ):
+                        future = pool.submit(
+                            jobs.execute, job.name, job.args, job.kwargs
+                        )
+                        running[future] = job
+                    if not running:
+                        if options['burst']:
+                            break
+                        time.sleep(options['poll_interval'])
+                        continue
+                    finished, _ = wait(
+                        running, timeout=options['poll_interval'],
+                        return_when=FIRST_COMPLETED,
+                    )
+                    for future in finished:
+                        self.record(running.pop(future), future)
+            finally:
+                # Ctrl+C: дожидаемся начатых задач, чтобы не выполнять
+                # их повторно после таймаута видимости.
+                for future in wait(running).done:
+                    self.record(running.pop(future), future)
+        self.stdout.write(self.style.SUCCESS(
+            f'Выполнено задач: {self.done}, с ошибкой: {self.failed}'
+        ))
+
+    def record(self, job, future):
+        error = future.exception()
+        if error is None:
+            jobs.complete(job, self.worker)
+            self.done += 1
+        else:
+            jobs.fail(job, self.worker, error)
+            self.failed += 1
+            self.stderr.write(f'{job}: {error!r}')
@@ -0,0 +1,35 @@
+from email import message_from_bytes
+
+from django.core.management.base import BaseCommand
+
+from core.smtp import SMTPSink
+
+
+class Command(BaseCommand):
+    help = (
+        'Запускает локальный SMTP-сервер, который печатает заголовки '
+        'принятых писем вместо отправки. Для проверки доставки через '
+        'django.core.mail.backends.smtp.EmailBackend без внешнего сервера.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=1025)
+
+    def handle(self, *args, **options):
+        sink = SMTPSink(options['host'], options['port'], self.show)
+        host, port = sink.server_address
+        self.stdout.write(f'SMTP-заглушка слушает {host}:{port}')
+        try:
+            sink.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            sink.server_close()
+
+    def show(self, email):
+        message = message_from_bytes(email.data)
+        self.stdout.write(
+            f'{email.sender} → {", ".join(email.recipients)}: '
+            f'{message["Subject"]}'
+        )
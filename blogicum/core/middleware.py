@@ -0,0 +1,107 @@
+import random
+from contextlib import ExitStack
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+
+from .perf import RequestMetrics, current_metrics
+from .routers import read_database
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReplicaMiddleware:
+    """
+    Отправляет чтение в settings.BLOG_READ_REPLICA для представлений
+    с use_replica = True. После успешной записи автор на
+    BLOG_REPLICA_PIN_SECONDS закрепляется за основной базой (cookie),
+    чтобы видеть свои изменения до синхронизации реплики.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = read_database.set(None)
+        try:
+            response = self.get_response(request)
+        finally:
+            read_database.reset(token)
+        if (
+            settings.BLOG_READ_REPLICA
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and request.user.is_authenticated
+        ):
+            response.set_cookie(
+                settings.BLOG_REPLICA_PIN_COOKIE, '1',
+                max_age=settings.BLOG_REPLICA_PIN_SECONDS,
+                httponly=True, samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        if (
+            settings.BLOG_READ_REPLICA
+            and request.method in SAFE_METHODS
+            and getattr(view_class, 'use_replica', False)
+            and settings.BLOG_REPLICA_PIN_COOKIE not in request.COOKIES
+        ):
+            # Сессия и пользователь читаются из основной базы:
+            # свежий вход не должен потеряться из-за отставания реплики.
+            request.user.is_authenticated
+            read_database.set(settings.BLOG_READ_REPLICA)
+
+
+class PerformanceMiddleware:
+    """
+    Для доли PERF_SAMPLE_RATE запросов считает число и время SQL,
+    время отрисовки шаблона, попадания в кеш и полное время и пишет
+    их строкой JSON в журнал core.performance. Заголовок Server-Timing
+    раскрывает устройство бэкенда, поэтому по умолчанию отдаётся
+    только сотрудникам (PERF_SERVER_TIMING). Остальные запросы
+    проходят без обёрток. Стоит первым в MIDDLEWARE, чтобы total
+    включал все слои.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= settings.PERF_SAMPLE_RATE:
+            return self.get_response(request)
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        started = perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(
+                        connections[alias].execute_wrapper(
+                            metrics.record_query
+                        )
+                    )
+                response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        metrics.total = perf_counter() - started
+        if self.shows_server_timing(request):
+            response['Server-Timing'] = metrics.server_timing()
+        metrics.log(request, response)
+        return response
+
+    @staticmethod
+    def shows_server_timing(request):
+        audience = settings.PERF_SERVER_TIMING
+        if audience == 'all':
+            return True
+        user = getattr(request, 'user', None)
+        return audience == 'staff' and user is not None and user.is_staff
+
+    def process_template_response(self, request, response):
+        metrics = current_metrics.get()
+        if metrics is not None:
+            metrics.time_render(response)
+        return response
@@ -1,8 +1,9 @@
 from django.db import models
+from django.utils import timezone
 
 
 class Base(models.Model):
-    """Абстр, добавляет is_pub=True и время создания записи"""
+    """Абстр, добавляет is_pub=True, время создания и изменения записи"""
 
     is_published = models.BooleanField(
         default=True,
@@ -11,6 +12,86 @@ class Base(models.Model):
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name='Добавлено')
+    # Не auto_now: у него нет default, и loaddata (raw, без pre_save)
+    # падает на фикстурах без этого поля. Время ставит save().
+    updated_at = models.DateTimeField(
+        default=timezone.now,
+        editable=False,
+        verbose_name='Изменено')
 
     class Meta:
         abstract = True
+
+    def save(self, *args, **kwargs):
+        self.updated_at = timezone.now()
+        super().save(*args, **kwargs)
+
+
+class Job(models.Model):
+    """Фоновая задача очереди core.jobs; выполняет команда run_jobs."""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUSES = (
+        (QUEUED, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField(max_length=256, verbose_name='Задача')
+    args = models.JSONField(default=list, verbose_name='Аргументы')
+    kwargs = models.JSONField(default=dict, verbose_name='Именованные')
+    status = models.CharField(
+        max_length=8, choices=STATUSES, default=QUEUED,
+        verbose_name='Статус')
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name='Попыток')
+    max_attempts = models.PositiveSmallIntegerField(
+        verbose_name='Максимум попыток')
+    run_at = models.DateTimeField(
+        default=timezone.now, verbose_name='Выполнить не раньше')
+    locked_until = models.DateTimeField(
+        null=True, blank=True, verbose_name='Занята до')
+    locked_by = models.CharField(
+        max_length=64, blank=True, verbose_name='Воркер')
+    last_error = models.TextField(blank=True, verbose_name='Ошибка')
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name='Добавлено')
+
+    class Meta:
+        verbose_name = 'фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        ordering = ('run_at', 'id')
+        indexes = (
+            models.Index(
+                fields=('status', 'run_at'), name='job_status_run_at_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.name} #{self.pk}'
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди QueuedEmailBackend: готовый MIME и конверт."""
+
+    sender = models.CharField(max_length=512, verbose_name='Отправитель')
+    recipients = models.JSONField(verbose_name='Получатели')
+    message = models.BinaryField(verbose_name='Письмо')
+    created_at = models.DateTimeField(
+        default=timezone.now, verbose_name='Поставлено в очередь')
+    claimed_by = models.CharField(max_length=64, blank=True)
+    claimed_until = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(
+        null=True, blank=True, verbose_name='Отправлено')
+
+    class Meta:
+        verbose_name = 'исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = (
+            models.Index(
+                fields=('sent_at', 'created_at'), name='email_sent_at_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.sender} → {", ".join(self.recipients)}'
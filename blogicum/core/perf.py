@@ -0,0 +1,118 @@
+import json
+import logging
+from contextvars import ContextVar
+from time import perf_counter
+
+from django.core.cache.backends.base import BaseCache
+
+logger = logging.getLogger('core.performance')
+
+# Метрики текущего запроса; None — запрос не попал в выборку.
+current_metrics = ContextVar('current_metrics', default=None)
+
+MISSING = object()
+
+
+class RequestMetrics:
+    """Счётчики одного запроса для Server-Timing и журнала."""
+
+    __slots__ = (
+        'queries', 'sql', 'template', 'cache_hits', 'cache_misses', 'total',
+    )
+
+    def __init__(self):
+        self.queries = 0
+        self.sql = self.template = self.total = 0.0
+        self.cache_hits = self.cache_misses = 0
+
+    def record_query(self, execute, sql, params, many, context):
+        """Обёртка для connection.execute_wrapper()."""
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql += perf_counter() - started
+
+    def time_render(self, response):
+        """Засекает отрисовку шаблона у TemplateResponse."""
+        render = response.render
+
+        def timed_render():
+            # Обёртка живёт до первого вызова: ответ попадает в кеш
+            # страниц pickle-ом, и замыкание в нём не нужно.
+            del response.render
+            started = perf_counter()
+            try:
+                return render()
+            finally:
+                self.template += perf_counter() - started
+
+        response.render = timed_render
+
+    def server_timing(self):
+        return ', '.join((
+            f'db;desc="SQL ({self.queries})";dur={self.sql * 1000:.1f}',
+            f'tpl;dur={self.template * 1000:.1f}',
+            f'cache;desc="hits {self.cache_hits}, misses '
+            f'{self.cache_misses}"',
+            f'total;dur={self.total * 1000:.1f}',
+        ))
+
+    def log(self, request, response):
+        """Одна строка JSON на запрос в журнал core.performance."""
+        match = request.resolver_match
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'db_queries': self.queries,
+            'db_ms': round(self.sql * 1000, 2),
+            'template_ms': round(self.template * 1000, 2),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'total_ms': round(self.total * 1000, 2),
+        }, ensure_ascii=False))
+
+
+def count_cache(hits, misses):
+    metrics = current_metrics.get()
+    if metrics is not None:
+        metrics.cache_hits += hits
+        metrics.cache_misses += misses
+
+
+def instrument_cache_backend(backend_class):
+    """
+    Оборачивает get() и собственный get_many() бэкенда кеша счётчиком
+    попаданий. У кеша Django нет сигналов, поэтому патчится класс;
+    вне выборки обёртка сводится к чтению ContextVar.
+    """
+    if getattr(backend_class, '_perf_instrumented', False):
+        return
+    get = backend_class.get
+
+    def instrumented_get(self, key, default=None, version=None):
+        if current_metrics.get() is None:
+            return get(self, key, default, version)
+        value = get(self, key, MISSING, version)
+        if value is MISSING:
+            count_cache(0, 1)
+            return default
+        count_cache(1, 0)
+        return value
+
+    backend_class.get = instrumented_get
+    # Базовый get_many() вызывает get() по ключу — его уже посчитали.
+    if backend_class.get_many is not BaseCache.get_many:
+        get_many = backend_class.get_many
+
+        def instrumented_get_many(self, keys, version=None):
+            keys = list(keys)
+            values = get_many(self, keys, version)
+            count_cache(len(values), len(keys) - len(values))
+            return values
+
+        backend_class.get_many = instrumented_get_many
+    backend_class._perf_instrumented = True
@@ -0,0 +1,19 @@
+from contextvars import ContextVar
+
+read_database = ContextVar('read_database', default=None)
+
+
+class ReplicaRouter:
+    """
+    Чтение идёт в реплику, только если её выбрал ReplicaMiddleware
+    для текущего запроса; всё остальное — в основную базу.
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_database.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
@@ -0,0 +1,90 @@
+import socketserver
+import threading
+from collections import namedtuple
+
+ReceivedEmail = namedtuple('ReceivedEmail', 'sender recipients data')
+
+
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """Минимальный диалог SMTP: принимает всё и ничего не пересылает."""
+
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode('ascii'))
+
+    def handle(self):
+        self.server.count_connection()
+        self.reply('220 blogicum SMTP sink')
+        sender, recipients = None, []
+        for raw in self.rfile:
+            command, _, argument = raw.decode('ascii', 'replace').strip(
+            ).partition(' ')
+            command = command.upper()
+            if command in ('HELO', 'EHLO'):
+                self.reply('250 blogicum')
+            elif command == 'MAIL':
+                sender = argument.partition(':')[2].strip().strip('<>')
+                recipients = []
+                self.reply('250 OK')
+            elif command == 'RCPT':
+                recipients.append(
+                    argument.partition(':')[2].strip().strip('<>')
+                )
+                self.reply('250 OK')
+            elif command == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                self.server.deliver(
+                    ReceivedEmail(sender, recipients, self.read_data())
+                )
+                sender, recipients = None, []
+                self.reply('250 OK')
+            elif command in ('RSET', 'NOOP'):
+                self.reply('250 OK')
+            elif command == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+    def read_data(self):
+        lines = []
+        for line in self.rfile:
+            if line in (b'.\r\n', b'.\n'):
+                break
+            lines.append(line[1:] if line.startswith(b'..') else line)
+        return b''.join(lines)
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    """
+    Локальная замена SMTP-сервера для тестов и разработки: письма
+    складываются в messages, connections считает сессии.
+    Порт 0 — свободный порт, выбранный системой.
+    """
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, on_message=None):
+        super().__init__((host, port), SMTPSinkHandler)
+        self.messages = []
+        self.connections = 0
+        self.on_message = on_message
+        self.lock = threading.Lock()
+
+    def count_connection(self):
+        with self.lock:
+            self.connections += 1
+
+    def deliver(self, email):
+        with self.lock:
+            self.messages.append(email)
+        if self.on_message:
+            self.on_message(email)
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,44 @@
+import hashlib
+import os
+import posixpath
+import re
+
+from django.core.files.storage import FileSystemStorage
+
+CONTENT_NAME = re.compile(r'(?:^|/)([0-9a-f]{2})/\1[0-9a-f]{62}\.\w+$')
+
+
+def is_content_name(name):
+    """Имя выдано ContentAddressedStorage и не меняет содержимого."""
+    return CONTENT_NAME.search(name) is not None
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Файлы называются по SHA-256 содержимого: posts/ab/ab12….jpg.
+    Повторная загрузка того же файла не пишет копию, а возвращает
+    имя уже сохранённого; по имени всегда отдаётся одно и то же,
+    поэтому такие файлы можно кешировать навсегда.
+    Файлы делят разные посты и удаляются только командой gc_media.
+    """
+
+    def content_name(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        hexdigest = digest.hexdigest()
+        return posixpath.join(
+            posixpath.dirname(name),
+            hexdigest[:2],
+            hexdigest + posixpath.splitext(name)[1].lower(),
+        )
+
+    def _save(self, name, content):
+        name = self.content_name(name, content)
+        if self.exists(name):
+            # Свежая отметка времени защищает файл, снова ставший
+            # нужным, от gc_media, который ещё не видит новую ссылку.
+            os.utime(self.path(name))
+            return name
+        return super()._save(name, content)
@@ -0,0 +1,17 @@
+from django.views.static import serve
+
+from .storage import is_content_name
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+def serve_media(request, path, document_root=None, show_indexes=False):
+    """
+    Как django.views.static.serve, но файлы с хешем содержимого
+    в имени браузер кеширует на год и не перепроверяет. Подключается
+    только при DEBUG; для веб-сервера то же правило описано в README.
+    """
+    response = serve(request, path, document_root, show_indexes)
+    if is_content_name(path):
+        response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return response
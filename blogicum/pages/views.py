@@ -20,8 +20,8 @@ def call_500(request):
 
 
 class AboutView(TemplateView):
-    template = 'pages/about.html'
+    template_name = 'pages/about.html'
 
 
 class RulesView(TemplateView):
-    template = 'pages/rules.html'
+    template_name = 'pages/rules.html'
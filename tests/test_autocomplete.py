@@ -0,0 +1,124 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from blog.autocomplete import PrefixCache, prefix_cache, suggest
+from blog.models import AutocompleteEntry
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clear_prefix_cache():
+    prefix_cache.clear()
+    yield
+    prefix_cache.clear()
+
+
+@pytest.fixture
+def make_post(mixer, user, published_category):
+    def make(title, **kwargs):
+        fields = {
+            "author": user, "category": published_category,
+            "is_published": True,
+            "pub_date": timezone.now() - timedelta(days=1), **kwargs,
+        }
+        return mixer.blend("blog.Post", title=title, **fields)
+    return make
+
+
+def labels(text):
+    return [item["label"] for item in suggest(text)]
+
+
+def test_matches_word_starts_case_insensitive(make_post):
+    post = make_post("Мой Первый пост про пост")
+    assert labels("ПЕРВ") == [post.title]
+    assert labels("пост") == [post.title], "Пост не должен дублироваться."
+    assert labels("ервый") == []
+    assert labels("м") == [], "Слишком короткий префикс."
+
+
+def test_kinds_urls_and_visibility(make_post, mixer, user,
+                                   published_category):
+    post = make_post("Тестовый пост")
+    make_post("Тестовый черновик", is_published=False)
+    make_post("Тестовое будущее", pub_date=timezone.now() + timedelta(days=1))
+    hidden = mixer.blend("blog.Category", is_published=False,
+                         title="Тестовая скрытая")
+    make_post("Тестовый в скрытой", category=hidden)
+    category = mixer.blend("blog.Category", is_published=True,
+                           title="Тестовая категория", slug="test-cat")
+    user.username = "тестовый_автор"
+    user.save()
+    results = {item["label"]: item for item in suggest("тестов")}
+    assert set(results) == {post.title, category.title, user.username}
+    assert results[post.title]["url"] == reverse(
+        "blog:post_detail", args=(post.id,))
+    assert results[category.title]["url"] == reverse(
+        "blog:category_posts", args=("test-cat",))
+    assert results[user.username]["kind"] == "user"
+
+
+def test_cache_hit_and_invalidation(make_post, django_assert_num_queries):
+    post = make_post("Кешируемый заголовок")
+    assert labels("кеш") == [post.title]
+    with django_assert_num_queries(0):
+        assert labels("кеш") == [post.title]
+    post.title = "Обновлённый заголовок"
+    post.save()
+    assert labels("кеш") == []
+    assert labels("обновл") == [post.title]
+    post.delete()
+    assert labels("обновл") == []
+
+
+def test_login_does_not_rebuild_entries(client, django_user_model):
+    person = django_user_model.objects.create_user(
+        username="входящий", password="pass"
+    )
+    entry_ids = set(
+        AutocompleteEntry.objects.filter(user=person)
+        .values_list("id", flat=True)
+    )
+    assert entry_ids
+    client.login(username="входящий", password="pass")
+    assert set(
+        AutocompleteEntry.objects.filter(user=person)
+        .values_list("id", flat=True)
+    ) == entry_ids
+
+
+def test_endpoint_and_rebuild(client, make_post):
+    post = make_post("Восстановленная подсказка")
+    AutocompleteEntry.objects.all().delete()
+    call_command("rebuild_autocomplete", stdout=StringIO())
+    response = client.get(reverse("blog:autocomplete"), {"q": "восст"})
+    assert response.status_code == 200
+    assert response.json()["results"][0]["label"] == post.title
+
+
+def test_lookup_uses_key_index(make_post):
+    make_post("Индекс подсказок")
+    queryset = AutocompleteEntry.objects.filter(
+        key__gte="инд", key__lt="ине"
+    ).order_by("key", "id")[:10]
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+        plan = [row[-1] for row in cursor.fetchall()]
+    assert any("USING INDEX autocomplete_key_idx" in step for step in plan)
+
+
+def test_prefix_cache_evicts_least_recently_used():
+    cache = PrefixCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
@@ -0,0 +1,191 @@
+import json
+import random
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from blog import urls as blog_urls
+from blog.models import Category, Comment, Location, Post
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from pages import urls as pages_urls
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite", reason="EXPLAIN QUERY PLAN — SQLite"
+    ),
+]
+
+BUDGETS_FILE = Path(__file__).parent / "budgets.json"
+
+N_USERS = 30
+N_POSTS = 400
+N_COMMENTS = 2000
+HOT_POST_SHARE = 0.5
+# Таблицы, которые растут с контентом: читать их целиком нельзя.
+FULL_SCANS = ("SCAN blog_post", "SCAN blog_comment")
+
+
+@pytest.fixture
+def dataset(user):
+    """Большой набор данных: половина комментариев у одного «горячего» поста."""
+    rnd = random.Random(42)
+    User = get_user_model()
+    # На SQLite bulk_create не проставляет id, поэтому строки перечитываются.
+    User.objects.bulk_create(
+        User(username=f"budget_user_{i}") for i in range(N_USERS)
+    )
+    users = list(User.objects.all())
+    Category.objects.bulk_create(
+        Category(title=f"Категория {i}", slug=f"budget-{i}",
+                 description="Описание " * 50)
+        for i in range(5)
+    )
+    categories = list(Category.objects.all())
+    Location.objects.bulk_create(
+        Location(name=f"Место {i}") for i in range(5)
+    )
+    locations = list(Location.objects.all())
+    now = timezone.now()
+    Post.objects.bulk_create(
+        Post(
+            author=rnd.choice(users) if i else user,
+            title=f"Пост {i}",
+            text="Слово " * rnd.randint(50, 500),
+            pub_date=now - timedelta(hours=i + 1),
+            category=rnd.choice(categories),
+            location=rnd.choice(locations + [None]),
+        )
+        for i in range(N_POSTS)
+    )
+    posts = list(Post.objects.order_by("-pub_date"))
+    hot_post = posts[0]
+    Comment.objects.bulk_create(
+        Comment(
+            author=rnd.choice(users),
+            post=hot_post if rnd.random() < HOT_POST_SHARE
+            else rnd.choice(posts),
+            text="Комментарий " * rnd.randint(1, 30),
+        )
+        for _ in range(N_COMMENTS)
+    )
+    call_command("recount_comments", stdout=StringIO())
+    call_command("rebuild_autocomplete", stdout=StringIO())
+    own_comment = Comment.objects.create(
+        author=user, post=hot_post, text="Свой комментарий"
+    )
+    return {
+        "post_id": hot_post.id,
+        "comment_id": own_comment.id,
+        "username": user.username,
+        "category_slug": hot_post.category.slug,
+    }
+
+
+def route_requests(dataset):
+    """Маршрут -> (метод, адрес, данные) для автора «горячего» поста."""
+    post = {"post_id": dataset["post_id"]}
+    comment = {**post, "comment_id": dataset["comment_id"]}
+    return {
+        "blog:index": ("get", reverse("blog:index"), {}),
+        "blog:search": ("get", reverse("blog:search"), {"q": "слово"}),
+        "blog:autocomplete": (
+            "get", reverse("blog:autocomplete"), {"q": "пост 1"}),
+        "blog:create_post": ("get", reverse("blog:create_post"), {}),
+        "blog:post_detail": (
+            "get", reverse("blog:post_detail", kwargs=post), {}),
+        "blog:edit_post": ("get", reverse("blog:edit_post", kwargs=post), {}),
+        "blog:delete_post": (
+            "get", reverse("blog:delete_post", kwargs=post), {}),
+        "blog:comments": ("get", reverse("blog:comments", kwargs=post), {}),
+        "blog:add_comment": (
+            "post", reverse("blog:add_comment", kwargs=post),
+            {"text": "Новый комментарий"}),
+        "blog:edit_comment": (
+            "get", reverse("blog:edit_comment", kwargs=comment), {}),
+        "blog:delete_comment": (
+            "get", reverse("blog:delete_comment", kwargs=comment), {}),
+        "blog:edit_profile": ("get", reverse("blog:edit_profile"), {}),
+        "blog:profile": (
+            "get", reverse("blog:profile",
+                           kwargs={"username": dataset["username"]}), {}),
+        "blog:category_posts": (
+            "get", reverse("blog:category_posts", kwargs={
+                "category_slug": dataset["category_slug"]}), {}),
+        "pages:about": ("get", reverse("pages:about"), {}),
+        "pages:rules": ("get", reverse("pages:rules"), {}),
+    }
+
+
+def all_route_names():
+    return {
+        f"{module.app_name}:{pattern.name}"
+        for module in (blog_urls, pages_urls)
+        for pattern in module.urlpatterns
+    }
+
+
+class PlanRecorder:
+    """Запоминает SELECT-запросы с параметрами для EXPLAIN QUERY PLAN."""
+
+    def __init__(self):
+        self.selects = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if sql.lstrip().upper().startswith("SELECT"):
+            self.selects.append((sql, params))
+        return execute(sql, params, many, context)
+
+    def slow_steps(self):
+        """Шаги планов, читающие большие таблицы целиком или сортирующие."""
+        steps = []
+        with connection.cursor() as cursor:
+            for sql, params in self.selects:
+                cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+                steps.extend(
+                    row[-1] for row in cursor.fetchall()
+                    if row[-1] in FULL_SCANS
+                    or "TEMP B-TREE FOR ORDER BY" in row[-1]
+                )
+        return steps
+
+
+def measure(client, method, url, data):
+    plans = PlanRecorder()
+    with CaptureQueriesContext(connection) as queries, \
+            connection.execute_wrapper(plans):
+        response = getattr(client, method)(url, data)
+    assert response.status_code in (200, 302), (url, response.status_code)
+    return {"queries": len(queries), "slow_steps": plans.slow_steps()}
+
+
+def test_every_route_has_a_budget():
+    budgets = json.loads(BUDGETS_FILE.read_text())
+    assert all_route_names() == set(budgets), (
+        f"Добавьте бюджет для новых маршрутов в {BUDGETS_FILE.name}."
+    )
+
+
+def test_routes_fit_budgets(user_client, dataset):
+    budgets = json.loads(BUDGETS_FILE.read_text())
+    overruns = []
+    for name, (method, url, data) in route_requests(dataset).items():
+        measured = measure(user_client, method, url, data)
+        budget = budgets[name]
+        if measured["queries"] > budget["queries"]:
+            overruns.append(
+                f"{name}: queries = {measured['queries']} "
+                f"> {budget['queries']}"
+            )
+        if len(measured["slow_steps"]) > budget["slow_steps"]:
+            overruns.append(
+                f"{name}: slow_steps = {measured['slow_steps']} "
+                f"> {budget['slow_steps']}"
+            )
+    assert not overruns, "Превышен бюджет:\n" + "\n".join(overruns)
@@ -0,0 +1,131 @@
+from io import StringIO
+
+import pytest
+from blog import deletion
+from blog.models import Category, Comment, Location, Post
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.management import CommandError, call_command
+from django.db.models import Count, F
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_seed_blog_creates_consistent_rows():
+    call_command(
+        "seed_blog", users=20, categories=3, locations=5, posts=300,
+        comments=2000, batch_size=128, seed=1, stdout=StringIO(),
+    )
+    assert get_user_model().objects.count() == 20
+    assert Post.objects.count() == 300
+    assert Comment.objects.count() == 2000
+    assert not Post.objects.annotate(
+        actual=Count("comments")
+    ).exclude(actual=F("comment_count")).exists()
+    top_author_posts = (
+        Post.objects.values("author").annotate(total=Count("id"))
+        .order_by("-total").values_list("total", flat=True).first()
+    )
+    assert top_author_posts > 300 / 20 * 2, "Авторы должны быть неравномерны."
+
+
+def test_seed_blog_skips_ids_of_soft_deleted_rows():
+    options = {
+        "users": 2, "categories": 1, "locations": 1, "posts": 3,
+        "comments": 4, "stdout": StringIO(),
+    }
+    call_command("seed_blog", **options)
+    Comment.objects.filter(
+        pk=Comment.objects.order_by("-id").first().pk
+    ).update(is_deleted=True)
+    deletion.soft_delete_post(Post.objects.order_by("-id").first())
+    call_command("seed_blog", **options)
+    assert Post._base_manager.count() == 6
+    assert Comment._base_manager.count() == 8
+
+
+@pytest.mark.parametrize(
+    "counts",
+    [
+        {"users": 0},
+        {"categories": 0},
+        {"posts": 0},
+        {"comments": -1},
+        {"batch_size": 0},
+    ],
+)
+def test_seed_blog_rejects_impossible_counts(counts):
+    options = {"users": 2, "categories": 1, "posts": 3, "comments": 5}
+    with pytest.raises(CommandError):
+        call_command("seed_blog", **{**options, **counts}, stdout=StringIO())
+    assert not Post.objects.exists()
+    assert not get_user_model().objects.exists()
+
+
+def test_seed_blog_accepts_empty_content():
+    call_command(
+        "seed_blog", users=0, categories=0, locations=0, posts=0,
+        comments=0, stdout=StringIO(),
+    )
+    assert not Post.objects.exists()
+
+
+def to_ms(moment):
+    return moment.replace(microsecond=moment.microsecond // 1000 * 1000)
+
+
+def test_import_fixture_restores_dumped_rows(tmp_path):
+    call_command(
+        "seed_blog", users=5, categories=2, locations=2, posts=40,
+        comments=150, batch_size=16, seed=2, stdout=StringIO(),
+    )
+    fixture = tmp_path / "dump.json"
+    call_command(
+        "dumpdata", "blog", "auth.user", output=str(fixture),
+        stdout=StringIO(),
+    )
+    # JSON dumpdata хранит время с точностью до миллисекунд.
+    expected = [
+        (pk, title, *map(to_ms, stamps), comment_count)
+        for pk, title, *stamps, comment_count
+        in Post.objects.order_by("id").values_list(
+            "id", "title", "pub_date", "created_at", "updated_at",
+            "comment_count",
+        )
+    ]
+    for model in (Post, Category, Location, get_user_model()):
+        model.objects.all().delete()
+
+    call_command(
+        "import_fixture", str(fixture), batch_size=7, stdout=StringIO()
+    )
+
+    assert list(
+        Post.objects.order_by("id").values_list(
+            "id", "title", "pub_date", "created_at", "updated_at",
+            "comment_count",
+        )
+    ) == expected
+    assert Comment.objects.count() == 150
+    assert get_user_model().objects.count() == 5
+
+
+def test_import_fixture_restores_user_groups_and_permissions(tmp_path):
+    group = Group.objects.create(name="Редакторы")
+    permission = Permission.objects.get(codename="change_post")
+    user = get_user_model().objects.create(username="editor")
+    user.groups.add(group)
+    user.user_permissions.add(permission)
+    fixture = tmp_path / "users.json"
+    call_command(
+        "dumpdata", "auth.group", "auth.user", output=str(fixture),
+        stdout=StringIO(),
+    )
+    get_user_model().objects.all().delete()
+    group.delete()
+
+    call_command("import_fixture", str(fixture), stdout=StringIO())
+
+    user = get_user_model().objects.get(username="editor")
+    assert list(user.groups.values_list("name", flat=True)) == ["Редакторы"]
+    assert list(user.user_permissions.all()) == [permission]
@@ -0,0 +1,65 @@
+from io import StringIO
+
+import pytest
+from blog.models import Comment, Post
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+
+def comment_count(post):
+    return Post.objects.values_list(
+        "comment_count", flat=True
+    ).get(pk=post.pk)
+
+
+def test_counter_follows_comment_create_and_delete(mixer):
+    post = mixer.blend("blog.Post")
+    first, second = mixer.cycle(2).blend("blog.Comment", post=post)
+    assert comment_count(post) == 2
+    first.text = "Правка"
+    first.save()
+    assert comment_count(post) == 2, "Правка не меняет счётчик."
+    first.delete()
+    assert comment_count(post) == 1
+    second.delete()
+    assert comment_count(post) == 0
+
+
+def test_recount_comments_repairs_drift(mixer):
+    drifted, empty, correct = mixer.cycle(3).blend("blog.Post")
+    mixer.cycle(3).blend("blog.Comment", post=drifted)
+    mixer.blend("blog.Comment", post=correct)
+    Post.objects.filter(pk=drifted.pk).update(comment_count=7)
+    Post.objects.filter(pk=empty.pk).update(comment_count=2)
+    stdout = StringIO()
+    call_command("recount_comments", chunk_size=2, stdout=stdout)
+    assert "Исправлено счётчиков: 2" in stdout.getvalue()
+    assert comment_count(drifted) == 3
+    assert comment_count(empty) == 0
+    assert comment_count(correct) == 1
+    assert Comment.objects.count() == 4
+
+
+def test_moving_comment_in_admin_moves_the_count(admin_client, mixer):
+    old_post, new_post = mixer.cycle(2).blend("blog.Post")
+    comment = mixer.blend("blog.Comment", post=old_post)
+    response = admin_client.post(
+        f"/admin/blog/comment/{comment.pk}/change/",
+        {
+            "text": comment.text,
+            "post": new_post.pk,
+            "author": comment.author_id,
+        },
+    )
+    assert response.status_code == 302
+    assert comment_count(old_post) == 0
+    assert comment_count(new_post) == 1
+    moved = Comment.objects.get(pk=comment.pk)
+    moved.text = "Правка после переноса"
+    moved.save()
+    assert comment_count(new_post) == 1
+    moved.post = old_post
+    moved.save()
+    moved.save()
+    assert (comment_count(old_post), comment_count(new_post)) == (1, 0)
@@ -0,0 +1,53 @@
+import re
+
+import pytest
+from blog.constants import COMMENTS_PAGINATE_BY
+
+pytestmark = [pytest.mark.django_db]
+
+COMMENT_ANCHOR = re.compile(r'name="comment_(\d+)"')
+FRAGMENT_URL = re.compile(r'data-fragment="([^"]+)"')
+
+
+@pytest.fixture
+def many_comments(mixer, user, post_with_published_location):
+    return mixer.cycle(COMMENTS_PAGINATE_BY * 2 + 3).blend(
+        "blog.Comment", author=user, post=post_with_published_location
+    )
+
+
+def test_comments_are_loaded_in_batches(
+        user_client, post_with_published_location, many_comments
+):
+    post = post_with_published_location
+    html = user_client.get(f"/posts/{post.id}/").content.decode()
+    batches = [[int(pk) for pk in COMMENT_ANCHOR.findall(html)]]
+    assert len(batches[0]) == COMMENTS_PAGINATE_BY
+
+    next_url = FRAGMENT_URL.search(html)
+    while next_url:
+        fragment = user_client.get(next_url.group(1).replace("&amp;", "&"))
+        assert fragment.status_code == 200
+        html = fragment.content.decode()
+        assert "<html" not in html
+        batches.append([int(pk) for pk in COMMENT_ANCHOR.findall(html)])
+        next_url = FRAGMENT_URL.search(html)
+
+    assert [len(batch) for batch in batches] == [
+        COMMENTS_PAGINATE_BY, COMMENTS_PAGINATE_BY, 3
+    ]
+    assert sum(batches, []) == [
+        comment.id for comment in sorted(
+            many_comments, key=lambda c: (c.created_at, c.id)
+        )
+    ]
+
+
+def test_comments_fragment_respects_post_visibility(
+        another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    response = another_user_client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == 404
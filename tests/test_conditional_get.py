@@ -0,0 +1,169 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from blog import cache
+from blog.deletion import soft_delete_post
+from blog.models import Category, Location, Post
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def urls(user, post_with_published_location):
+    post = post_with_published_location
+    return [
+        "/",
+        "/?cursor=",
+        f"/profile/{user.username}/",
+        f"/category/{post.category.slug}/",
+        f"/posts/{post.id}/",
+    ]
+
+
+def revalidate(client, url, response):
+    headers = {"HTTP_IF_NONE_MATCH": response["ETag"]}
+    with CaptureQueriesContext(connection) as queries:
+        revalidated = client.get(url, **headers)
+    return revalidated, queries
+
+
+def test_unchanged_pages_return_304(user_client, urls):
+    for url in urls:
+        response = user_client.get(url)
+        assert response.status_code == HTTPStatus.OK, url
+        assert response.has_header("Last-Modified"), url
+        revalidated, queries = revalidate(user_client, url, response)
+        assert revalidated.status_code == HTTPStatus.NOT_MODIFIED, url
+        assert not revalidated.content
+        assert not any(
+            "blog_comment" in query["sql"]
+            for query in queries.captured_queries
+        ), "Валидатор не должен загружать комментарии."
+
+
+def test_changes_invalidate_etag(
+        user_client, user, mixer, urls, post_with_published_location
+):
+    post = post_with_published_location
+    etags = {url: user_client.get(url)["ETag"] for url in urls}
+
+    mixer.blend("blog.Comment", post=post, author=user)
+    for url in urls:
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+        assert response.status_code == HTTPStatus.OK, url
+        etags[url] = response["ETag"]
+
+    post.category.title = post.category.title + " (новое)"
+    post.category.save()
+    for url in urls:
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+        assert response.status_code == HTTPStatus.OK, url
+
+
+def test_etag_differs_between_users(
+        user_client, another_user_client, urls
+):
+    for url in urls:
+        assert user_client.get(url)["ETag"] != (
+            another_user_client.get(url)["ETag"]
+        ), url
+
+
+def test_commenter_rename_invalidates_post_etag(
+        user_client, another_user, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.blend("blog.Comment", post=post, author=another_user)
+    url = f"/posts/{post.id}/"
+    etag = user_client.get(url)["ETag"]
+    another_user.username = "renamed_commenter"
+    another_user.save()
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert "renamed_commenter" in response.content.decode()
+
+
+def test_fixture_without_updated_at_loads(settings):
+    call_command("loaddata", settings.BASE_DIR / "db.json", verbosity=0)
+    assert Category.objects.exists()
+
+
+def make_stamps_old():
+    """
+    Все правки контента — сутки назад: Last-Modified в секундах,
+    и без этого изменение в ту же секунду не отличить.
+    """
+    day_ago = timezone.now() - timedelta(days=1)
+    for model in (Post, Category, Location, get_user_model()):
+        model.objects.update(**(
+            {"last_login": day_ago} if model is get_user_model()
+            else {"updated_at": day_ago}
+        ))
+    cache.get_cache().set(
+        cache.PAGE_CACHE_VERSION_KEY, int(day_ago.timestamp()) * 10 ** 9,
+        None
+    )
+
+
+def test_relogin_revalidates_page_with_form(
+        client, user, post_with_published_location
+):
+    user.set_password("password")
+    user.save()
+    client.login(username=user.username, password="password")
+    make_stamps_old()
+    url = f"/posts/{post_with_published_location.id}/"
+    response = client.get(url)
+    assert "csrfmiddlewaretoken" in response.content.decode()
+
+    client.logout()
+    client.post(
+        "/auth/login/", {"username": user.username, "password": "password"}
+    )
+    for header, value in (
+        ("HTTP_IF_NONE_MATCH", response["ETag"]),
+        ("HTTP_IF_MODIFIED_SINCE", response["Last-Modified"]),
+    ):
+        assert client.get(url, **{header: value}).status_code == (
+            HTTPStatus.OK
+        ), header
+
+
+def test_list_last_modified_follows_membership(
+        client, mixer, monkeypatch, post_with_published_location
+):
+    def revalidate_feed():
+        response = client.get("/", **since)
+        return response.status_code, response.content.decode()
+
+    deleted = post_with_published_location
+    now = timezone.now()
+    scheduled = mixer.blend(
+        "blog.Post", is_published=True, category=deleted.category,
+        pub_date=now + timedelta(hours=1),
+    )
+    make_stamps_old()
+    since = {"HTTP_IF_MODIFIED_SINCE": client.get("/")["Last-Modified"]}
+    assert revalidate_feed()[0] == HTTPStatus.NOT_MODIFIED
+
+    soft_delete_post(deleted)
+    status, content = revalidate_feed()
+    assert status == HTTPStatus.OK
+    assert deleted.title not in content
+
+    make_stamps_old()
+    since = {"HTTP_IF_MODIFIED_SINCE": client.get("/")["Last-Modified"]}
+    # Отложенный пост выходит без сигналов — просто проходит время,
+    # и закешированная страница истекает.
+    monkeypatch.setattr(timezone, "now", lambda: now + timedelta(hours=2))
+    cache.get_cache().clear()
+    make_stamps_old()
+    status, content = revalidate_feed()
+    assert status == HTTPStatus.OK
+    assert scheduled.title in content
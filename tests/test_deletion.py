@@ -0,0 +1,156 @@
+import pytest
+from blog import deletion
+from blog.models import AutocompleteEntry, Comment, Post
+from core.models import Job
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def post_with_comments(mixer, user):
+    post = mixer.blend(
+        "blog.Post", author=user, title="Удаляемый пост", is_published=True,
+        category__is_published=True,
+    )
+    mixer.cycle(30).blend("blog.Comment", post=post, author=user)
+    return post
+
+
+def test_delete_view_hides_post_and_queues_purge(
+    user_client, post_with_comments
+):
+    post = post_with_comments
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.post(f"/posts/{post.id}/delete/")
+    assert response.status_code == 302
+    assert not any(
+        query["sql"].startswith(
+            ('DELETE FROM "blog_post"', 'DELETE FROM "blog_comment"')
+        )
+        for query in queries.captured_queries
+    )
+    assert not Post.objects.filter(pk=post.pk).exists()
+    assert Post._base_manager.get(pk=post.pk).is_deleted
+    assert user_client.get(f"/posts/{post.id}/").status_code == 404
+    assert not AutocompleteEntry.objects.filter(
+        post_id=post.pk, is_published=True
+    ).exists()
+    job = Job.objects.get(name=deletion.purge_post.job_name)
+    assert job.args == [post.pk]
+
+    deletion.purge_post(post.pk)
+    assert not Post._base_manager.filter(pk=post.pk).exists()
+    assert not Comment.objects.filter(post_id=post.pk).exists()
+
+
+def test_delete_in_batches_uses_one_statement_per_batch(post_with_comments):
+    with CaptureQueriesContext(connection) as queries:
+        deleted = deletion.delete_in_batches(
+            Comment.objects.filter(post=post_with_comments),
+            batch_size=7, raw=True,
+        )
+    assert deleted == 30
+    deletes = [
+        query["sql"] for query in queries.captured_queries
+        if query["sql"].startswith("DELETE")
+    ]
+    assert len(deletes) == 5
+
+
+def test_admin_user_delete_is_soft_then_purged(
+    admin_client, mixer, user, post_with_comments
+):
+    other_post = mixer.blend("blog.Post", comment_count=0)
+    mixer.cycle(3).blend("blog.Comment", post=other_post, author=user)
+    other_post.refresh_from_db()
+    assert other_post.comment_count == 3
+
+    response = admin_client.post(
+        f"/admin/auth/user/{user.pk}/delete/", {"post": "yes"}
+    )
+    assert response.status_code == 302
+    user.refresh_from_db()
+    assert not user.is_active
+    assert not Post.objects.filter(author=user).exists()
+    other_post.refresh_from_db()
+    assert other_post.comment_count == 0
+    assert not other_post.comments.exists()
+    assert Job.objects.filter(
+        name=deletion.purge_user.job_name, args=[user.pk]
+    ).exists()
+
+    deletion.purge_user(user.pk)
+    assert not get_user_model().objects.filter(pk=user.pk).exists()
+    assert not Post._base_manager.filter(author_id=user.pk).exists()
+    other_post.refresh_from_db()
+    assert other_post.comment_count == 0
+
+
+@pytest.fixture
+def deleted_author(mixer, user, post_with_comments):
+    other_post = mixer.blend(
+        "blog.Post", is_published=True, category__is_published=True
+    )
+    mixer.cycle(2).blend("blog.Comment", post=other_post, author=user)
+    deletion.soft_delete_user(user)
+    other_post.refresh_from_db()
+    assert other_post.comment_count == 0
+    return other_post
+
+
+def test_reactivated_user_keeps_content(user, post_with_comments,
+                                        deleted_author):
+    user.is_active = True
+    user.save()
+    deletion.purge_user(user.pk)
+
+    assert get_user_model().objects.filter(pk=user.pk).exists()
+    assert Post.objects.get(pk=post_with_comments.pk).comments.count() == 30
+    deleted_author.refresh_from_db()
+    assert deleted_author.comment_count == 2
+    assert deleted_author.comments.count() == 2
+
+
+def test_reactivation_keeps_separately_deleted_posts(
+    mixer, user, post_with_comments
+):
+    deleted_post = mixer.blend("blog.Post", author=user)
+    deletion.soft_delete_post(deleted_post)
+    deletion.soft_delete_user(user)
+    user.is_active = True
+    user.save()
+    deletion.purge_post(deleted_post.pk)
+
+    assert Post.objects.filter(pk=post_with_comments.pk).exists()
+    assert not Post._base_manager.filter(pk=deleted_post.pk).exists(), (
+        "Пост, удалённый автором до удаления учётной записи, не "
+        "возвращается при её включении."
+    )
+
+
+def test_banned_user_is_not_purged(user, post_with_comments):
+    user.is_active = False
+    user.save()
+    deletion.purge_user(user.pk)
+    assert get_user_model().objects.filter(pk=user.pk).exists()
+    assert Post.objects.filter(pk=post_with_comments.pk).exists()
+
+
+def test_admin_delete_still_checks_related_permissions(client, mixer, user):
+    staff = mixer.blend(get_user_model(), is_staff=True)
+    staff.user_permissions.set(Permission.objects.filter(
+        codename__in=("view_user", "change_user", "delete_user")
+    ))
+    client.force_login(staff)
+    url = f"/admin/auth/user/{user.pk}/delete/"
+    lacking = client.get(url).context["perms_lacking"]
+    assert {str(Post._meta.verbose_name), str(Comment._meta.verbose_name)} <= (
+        set(map(str, lacking))
+    )
+    assert client.post(url, {"post": "yes"}).status_code == 403
+    user.refresh_from_db()
+    assert user.is_active
@@ -0,0 +1,96 @@
+import re
+
+import pytest
+from blog.urls import urlpatterns
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+pytestmark = [pytest.mark.django_db]
+
+EDIT_DELETE_URL_NAMES = sorted(
+    pattern.name for pattern in urlpatterns
+    if re.match(r"(edit|delete)_", pattern.name)
+)
+
+# Число SQL-запросов на GET страницы правки/удаления автором
+# (сессия, пользователь, объект и справочники формы).
+EXPECTED_GET_QUERIES = {
+    "delete_comment": 3,
+    "delete_post": 4,
+    "edit_comment": 3,
+    "edit_post": 5,
+    "edit_profile": 2,
+}
+
+TARGET_TABLES = {
+    "delete_comment": "blog_comment",
+    "delete_post": "blog_post",
+    "edit_comment": "blog_comment",
+    "edit_post": "blog_post",
+    "edit_profile": None,
+}
+
+
+@pytest.fixture
+def own_comment(mixer, user, post_with_published_location):
+    return mixer.blend(
+        "blog.Comment", author=user, post=post_with_published_location
+    )
+
+
+@pytest.fixture
+def url_for(own_comment):
+    comment = own_comment
+    kwargs = {
+        "edit_post": {"post_id": comment.post_id},
+        "delete_post": {"post_id": comment.post_id},
+        "edit_comment": {
+            "post_id": comment.post_id, "comment_id": comment.id
+        },
+        "delete_comment": {
+            "post_id": comment.post_id, "comment_id": comment.id
+        },
+        "edit_profile": {},
+    }
+    return lambda name: reverse(f"blog:{name}", kwargs=kwargs[name])
+
+
+def target_row_queries(queries, table):
+    return [
+        query["sql"] for query in queries.captured_queries
+        if query["sql"].startswith("SELECT")
+        and f'FROM "{table}"' in query["sql"]
+    ]
+
+
+def test_every_edit_delete_url_is_covered():
+    assert set(EDIT_DELETE_URL_NAMES) == set(EXPECTED_GET_QUERIES)
+
+
+@pytest.mark.parametrize("url_name", EDIT_DELETE_URL_NAMES)
+def test_edit_delete_get_queries(
+        user_client, url_for, url_name, django_assert_num_queries
+):
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get(url_for(url_name))
+    assert response.status_code == 200
+    table = TARGET_TABLES[url_name]
+    if table:
+        assert len(target_row_queries(queries, table)) == 1, (
+            f"{url_name}: объект должен загружаться один раз."
+        )
+    with django_assert_num_queries(EXPECTED_GET_QUERIES[url_name]):
+        user_client.get(url_for(url_name))
+
+
+@pytest.mark.parametrize(
+    "url_name", [name for name in EDIT_DELETE_URL_NAMES if "delete" in name]
+)
+def test_delete_loads_target_once(user_client, url_for, url_name):
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.post(url_for(url_name))
+    assert response.status_code == 302
+    assert len(target_row_queries(queries, TARGET_TABLES[url_name])) == 1, (
+        f"{url_name}: объект должен загружаться один раз."
+    )
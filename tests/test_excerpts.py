@@ -0,0 +1,56 @@
+from io import StringIO
+
+import pytest
+from blog.models import Post, text_stats
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def seeded():
+    call_command(
+        "seed_blog", users=3, categories=2, locations=2, posts=25,
+        comments=0, seed=4, stdout=StringIO(),
+    )
+
+
+def test_save_maintains_excerpt_and_reading_time(mixer, user):
+    post = mixer.blend("blog.Post", author=user, text="слово " * 450)
+    post.refresh_from_db()
+    assert post.excerpt == "слово " * 9 + "слово …"
+    assert post.reading_time == 3
+
+    post.text = "Короткий текст."
+    post.save(update_fields=["text"])
+    post.refresh_from_db()
+    assert (post.excerpt, post.reading_time) == ("Короткий текст.", 1)
+
+
+def test_backfill_fixes_stale_rows(seeded):
+    Post.objects.filter(id__lte=10).update(excerpt="", reading_time=99)
+    out = StringIO()
+    call_command("backfill_post_excerpts", chunk_size=4, stdout=out)
+    assert "Обновлено анонсов: 10" in out.getvalue()
+    for text, excerpt, reading_time in Post.objects.values_list(
+        "text", "excerpt", "reading_time"
+    ):
+        assert (excerpt, reading_time) == text_stats(text)
+
+
+def test_feed_does_not_read_post_text(seeded, client):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(reverse("blog:index"))
+    assert response.status_code == 200
+    post_queries = [
+        query["sql"] for query in queries.captured_queries
+        if 'FROM "blog_post"' in query["sql"]
+    ]
+    assert post_queries
+    for sql in post_queries:
+        assert '"blog_post"."text"' not in sql, sql
+    first = response.context["page_obj"][0]
+    assert first.excerpt in response.content.decode()
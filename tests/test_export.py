@@ -0,0 +1,65 @@
+import csv
+import json
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from blog.models import Comment, Post
+from django.core.management import call_command
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def seeded():
+    call_command(
+        "seed_blog", users=5, categories=2, locations=2, posts=30,
+        comments=120, seed=3, stdout=StringIO(),
+    )
+    cutoff = timezone.now() - timedelta(days=1)
+    Comment.objects.filter(id__lte=40).update(
+        created_at=cutoff - timedelta(days=1)
+    )
+    return cutoff
+
+
+def test_export_comments_jsonl_since(seeded, tmp_path):
+    output = tmp_path / "comments.jsonl"
+    call_command(
+        "export_blog", "comments", since=seeded.isoformat(),
+        output=str(output), chunk_size=7,
+    )
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [row["id"] for row in rows] == list(
+        Comment.objects.filter(created_at__gte=seeded)
+        .order_by("id").values_list("id", flat=True)
+    )
+    assert len(rows) == 80
+    assert rows[0]["author_username"]
+
+
+def test_export_posts_csv_to_stdout(seeded):
+    stdout = StringIO()
+    call_command("export_blog", "posts", format="csv", stdout=stdout)
+    rows = list(csv.DictReader(StringIO(stdout.getvalue())))
+    assert len(rows) == Post.objects.count()
+    post = Post.objects.get(id=rows[0]["id"])
+    assert rows[0]["title"] == post.title
+    assert int(rows[0]["comment_count"]) == post.comment_count
+
+
+def test_admin_export_action_streams(seeded, admin_client):
+    selected = list(Post.objects.values_list("id", flat=True)[:5])
+    response = admin_client.post(
+        "/admin/blog/post/",
+        {"action": "export_jsonl", "_selected_action": selected},
+    )
+    assert response.status_code == 200
+    assert response.streaming
+    assert "attachment" in response["Content-Disposition"]
+    rows = [
+        json.loads(line)
+        for line in b"".join(response.streaming_content).splitlines()
+    ]
+    assert sorted(row["id"] for row in rows) == sorted(selected)
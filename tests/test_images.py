@@ -0,0 +1,136 @@
+from io import BytesIO, StringIO
+from time import sleep
+from unittest import mock
+
+import pytest
+from blog import images
+from blog.models import Post
+from core.models import Job
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import connections
+from PIL import Image
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.JOBS_EAGER = True
+
+
+def upload(name, size, mode="RGB", image_format="JPEG"):
+    buffer = BytesIO()
+    Image.new(mode, size, "red").save(buffer, image_format)
+    return default_storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def test_make_variants_downscales_to_webp():
+    variants = images.make_variants(upload("posts/big.jpg", (2000, 1000)))
+    assert [width for width, _ in variants["files"]] == [320, 640, 1280]
+    assert (variants["width"], variants["height"]) == (2000, 1000)
+    with default_storage.open(variants["files"][1][1]) as stored:
+        with Image.open(stored) as variant:
+            assert variant.format == "WEBP"
+            assert variant.size == (640, 320)
+
+    small = images.make_variants(
+        upload("posts/small.png", (200, 100), "RGBA", "PNG")
+    )
+    assert [width for width, _ in small["files"]] == [200]
+
+
+def test_upload_schedules_variants_after_commit(
+    mixer, user, client, django_capture_on_commit_callbacks
+):
+    name = upload("posts/photo.jpg", (1500, 900))
+    with django_capture_on_commit_callbacks(execute=True):
+        post = mixer.blend(
+            "blog.Post", author=user, image=name, is_published=True,
+            category__is_published=True,
+        )
+    post.refresh_from_db()
+    assert post.image_variants["name"] == name
+    assert post.image_srcset.count("w, ") == 2
+
+    cache.clear()
+    card = client.get("/").content.decode()
+    assert post.image_srcset in card and 'loading="lazy"' in card
+    detail = client.get(f"/posts/{post.id}/").content.decode()
+    assert post.image_srcset in detail and 'loading="lazy"' not in detail
+
+
+@pytest.mark.django_db(transaction=True)
+def test_upload_enqueues_resize_job(mixer, user, settings):
+    settings.JOBS_EAGER = False
+    name = upload("posts/queued.jpg", (800, 600))
+    post = mixer.blend("blog.Post", author=user, image=name)
+    job = Job.objects.get()
+    assert (job.name, job.args) == (
+        "blog.images.process_post_image", [post.pk, name]
+    )
+    post.refresh_from_db()
+    assert post.image_variants == {} and post.image_srcset == ""
+
+    call_command("run_jobs", burst=True, workers=1, stdout=StringIO())
+    post.refresh_from_db()
+    assert post.image_variants["name"] == name
+    assert not Job.objects.exists()
+
+
+def test_backfill_command_processes_pending_images(mixer, user):
+    good = [upload(f"posts/old{i}.jpg", (900, 600)) for i in range(3)]
+    broken = default_storage.save("posts/broken.jpg", ContentFile(b"oops"))
+    posts = [mixer.blend("blog.Post", author=user, image=name)
+             for name in good + [broken]]
+    mixer.blend("blog.Post", author=user, image="")
+
+    out = StringIO()
+    call_command(
+        "generate_image_variants", workers=2, batch_size=2, stdout=out
+    )
+    assert "Обработано картинок: 3, с ошибками: 1" in out.getvalue()
+    for post, name in zip(posts, good):
+        post.refresh_from_db()
+        assert [width for width, _ in post.image_variants["files"]] == [
+            320, 640, 900
+        ]
+
+    out = StringIO()
+    call_command("generate_image_variants", stdout=out)
+    assert "Обработано картинок: 0, с ошибками: 1" in out.getvalue()
+
+
+def test_backfill_resizes_outside_the_write_transaction(mixer, user):
+    for i in range(3):
+        mixer.blend(
+            "blog.Post", author=user,
+            image=upload(f"posts/batch{i}.jpg", (400, 300)),
+        )
+    # Соединение потока команды; тест уже идёт в транзакции, поэтому
+    # новая транзакция команды видна как лишняя точка сохранения.
+    command_connection = connections["default"]
+    depth = len(command_connection.savepoint_ids)
+    in_transaction = []
+
+    def make_variants(name):
+        sleep(0.05)
+        in_transaction.append(
+            len(command_connection.savepoint_ids) > depth
+        )
+        return images.try_make_variants(name)
+
+    with mock.patch(
+        "blog.management.commands.generate_image_variants.try_make_variants",
+        make_variants,
+    ):
+        call_command(
+            "generate_image_variants", workers=1, batch_size=3,
+            stdout=StringIO(),
+        )
+    assert in_transaction == [False] * 3, (
+        "Картинки нарезаются до транзакции с записью в базу."
+    )
@@ -0,0 +1,131 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from core import jobs
+from core.models import Job
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+calls = []
+
+
+@jobs.job
+def record(value):
+    calls.append(value)
+
+
+@jobs.job(max_attempts=2)
+def flaky(value):
+    calls.append(value)
+    if calls.count(value) == 1:
+        raise RuntimeError("первый запуск всегда падает")
+
+
+@jobs.job
+def report_inherited_connection(path):
+    from django.db import connections
+
+    with open(path, "a") as report:
+        report.write(f"{connections['default'].connection is not None}\n")
+
+
+def broken():
+    pass
+
+
+@pytest.fixture(autouse=True)
+def clean_calls():
+    calls.clear()
+
+
+def run_worker(**options):
+    out, err = StringIO(), StringIO()
+    call_command("run_jobs", burst=True, stdout=out, stderr=err, **options)
+    return out.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("pool", ["thread", "process"])
+def test_worker_runs_queued_jobs(pool):
+    for value in range(5):
+        jobs.enqueue(record, value)
+    later = jobs.enqueue(record, "later", delay=timedelta(hours=1))
+    output = run_worker(workers=3, pool=pool)
+    assert "Выполнено задач: 5, с ошибкой: 0" in output
+    if pool == "thread":
+        assert sorted(calls) == list(range(5))
+    assert list(Job.objects.values_list("pk", flat=True)) == [later.pk]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_process_pool_does_not_inherit_connections(tmp_path):
+    report = tmp_path / "report.txt"
+    for _ in range(3):
+        jobs.enqueue(report_inherited_connection, str(report))
+    run_worker(workers=2, pool="process")
+    assert report.read_text().split() == ["False"] * 3, (
+        "Процессы пула не должны получать соединение родителя."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_failed_job_is_retried_with_backoff(settings):
+    settings.JOBS_RETRY_DELAY = 60
+    job = jobs.enqueue(flaky, "x")
+    assert "с ошибкой: 1" in run_worker(workers=1)
+    job.refresh_from_db()
+    assert (job.status, job.attempts) == (Job.QUEUED, 1)
+    assert "RuntimeError" in job.last_error
+    assert job.run_at > timezone.now() + timedelta(seconds=50)
+
+    Job.objects.update(run_at=timezone.now())
+    assert "Выполнено задач: 1" in run_worker(workers=1)
+    assert calls == ["x", "x"] and not Job.objects.exists()
+
+
+@pytest.mark.django_db
+def test_job_fails_after_max_attempts():
+    job = jobs.enqueue(flaky, "y")
+    calls.append("y")
+    [claimed] = jobs.claim(1, "w", 60)
+    jobs.fail(claimed, "w", RuntimeError("снова"))
+    Job.objects.update(run_at=timezone.now())
+    [claimed] = jobs.claim(1, "w", 60)
+    jobs.fail(claimed, "w", RuntimeError("и снова"))
+    job.refresh_from_db()
+    assert (job.status, job.attempts) == (Job.FAILED, 2)
+    assert jobs.claim(1, "w", 60) == []
+
+
+@pytest.mark.django_db
+def test_visibility_timeout_hands_job_to_another_worker():
+    job = jobs.enqueue(record, 1)
+    assert [j.pk for j in jobs.claim(5, "first", 60)] == [job.pk]
+    assert jobs.claim(5, "second", 60) == []
+
+    Job.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+    [stolen] = jobs.claim(5, "second", 60)
+    assert (stolen.locked_by, stolen.attempts) == ("second", 2)
+    jobs.complete(job, "first")
+    assert Job.objects.exists(), "Опоздавший воркер не удаляет чужую задачу."
+    jobs.complete(stolen, "second")
+    assert not Job.objects.exists()
+
+
+@pytest.mark.django_db
+def test_enqueue_is_transactional(settings, django_capture_on_commit_callbacks):
+    with pytest.raises(ZeroDivisionError):
+        with transaction.atomic():
+            jobs.enqueue(record, 1)
+            1 / 0
+    assert not Job.objects.exists()
+    with pytest.raises(jobs.NotAJob):
+        jobs.enqueue(broken)
+
+    settings.JOBS_EAGER = True
+    with django_capture_on_commit_callbacks(execute=True):
+        assert jobs.enqueue(record, "eager") is None
+        assert calls == []
+    assert calls == ["eager"] and not Job.objects.exists()
@@ -0,0 +1,66 @@
+from datetime import timedelta
+
+import pytest
+from conftest import N_PER_PAGE
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts_with_equal_dates(mixer, user, published_category):
+    # Одинаковые pub_date проверяют, что id разрешает «ничьи» в ключе.
+    base = timezone.now() - timedelta(hours=1)
+    pub_dates = [
+        base - timedelta(days=i // 3) for i in range(N_PER_PAGE * 2 + 5)
+    ]
+    return mixer.cycle(len(pub_dates)).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=None,
+        is_published=True,
+        pub_date=(pub_date for pub_date in pub_dates),
+    )
+
+
+@pytest.mark.parametrize("url_name", ["index", "profile", "category"])
+def test_keyset_pages_cover_all_posts(
+        user_client, user, published_category, posts_with_equal_dates,
+        url_name
+):
+    url = {
+        "index": "/",
+        "profile": f"/profile/{user.username}/",
+        "category": f"/category/{published_category.slug}/",
+    }[url_name]
+    expected = sorted(
+        posts_with_equal_dates, key=lambda p: (p.pub_date, p.id),
+        reverse=True
+    )
+
+    seen, pages, cursor = [], [], ""
+    while cursor is not None:
+        with CaptureQueriesContext(connection) as queries:
+            response = user_client.get(url, {"cursor": cursor})
+        assert response.status_code == 200
+        assert not any(
+            "COUNT(" in query["sql"] for query in queries.captured_queries
+        ), "Пагинация по курсору не должна выполнять COUNT(*)."
+        page = response.context["page_obj"]
+        pages.append(page)
+        seen.extend(post.id for post in page)
+        cursor = page.next_cursor
+    assert seen == [post.id for post in expected]
+    assert all(len(page) == N_PER_PAGE for page in pages[:-1])
+
+    response = user_client.get(url, {"cursor": pages[-1].previous_cursor})
+    assert [post.id for post in response.context["page_obj"]] == [
+        post.id for post in pages[-2]
+    ]
+
+
+def test_invalid_cursor_returns_404(user_client):
+    assert user_client.get("/", {"cursor": "not-a-cursor"}).status_code == 404
@@ -0,0 +1,115 @@
+from email import message_from_bytes
+from io import StringIO
+
+import pytest
+from core.mail import (OutboxNotEmpty, claim_emails, deliver_outbox,
+                       outbox_stats)
+from core.models import Job, OutgoingEmail
+from core.smtp import SMTPSink
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+
+
+@pytest.fixture
+def smtp(settings):
+    settings.EMAIL_BACKEND = "core.mail.QueuedEmailBackend"
+    settings.EMAIL_DELIVERY_BACKEND = (
+        "django.core.mail.backends.smtp.EmailBackend"
+    )
+    with SMTPSink() as sink:
+        settings.EMAIL_HOST, settings.EMAIL_PORT = sink.server_address
+        yield sink
+
+
+class FlakyBackend(EmailBackend):
+    """Обрывает доставку на письме №fail_at."""
+
+    fail_at = None
+
+    def send_messages(self, messages):
+        for message in messages:
+            if len(mail.outbox) == self.fail_at:
+                raise ConnectionError("соединение оборвалось")
+            super().send_messages([message])
+        return len(messages)
+
+
+def send(count):
+    for number in range(count):
+        mail.EmailMessage(
+            f"Письмо №{number}", "Привет!", "blog@example.com",
+            [f"user{number}@example.com"], bcc=["audit@example.com"],
+        ).send()
+
+
+@pytest.mark.django_db
+def test_backend_queues_without_delivering(smtp):
+    send(3)
+    assert OutgoingEmail.objects.count() == 3
+    assert Job.objects.filter(name=deliver_outbox.job_name).count() == 1
+    assert smtp.messages == []
+    assert outbox_stats()["queue_depth"] == 3
+
+
+@pytest.mark.django_db
+def test_delivery_batches_over_one_connection(smtp, settings):
+    settings.EMAIL_BATCH_SIZE = 2
+    send(5)
+    deliver_outbox()
+    assert smtp.connections == 1
+    assert len(smtp.messages) == 5
+    first = smtp.messages[0]
+    assert first.sender == "blog@example.com"
+    assert first.recipients == ["user0@example.com", "audit@example.com"]
+    parsed = message_from_bytes(first.data)
+    assert "Bcc" not in parsed
+    assert parsed.get_payload(decode=True).decode().strip() == "Привет!"
+
+    stats = outbox_stats()
+    assert (stats["queue_depth"], stats["sent"]) == (0, 5)
+    assert stats["latency_max_seconds"] >= stats["latency_p50_seconds"] >= 0
+    out = StringIO()
+    call_command("mail_stats", stdout=out)
+    assert "queue_depth: 0" in out.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_password_reset_is_delivered_by_worker(smtp, client, mixer):
+    mixer.blend("auth.User", email="reader@example.com")
+    response = client.post(
+        "/auth/password_reset/", {"email": "reader@example.com"}
+    )
+    assert response.status_code == 302
+    assert smtp.messages == []
+
+    call_command("run_jobs", burst=True, stdout=StringIO())
+    [received] = smtp.messages
+    assert received.recipients == ["reader@example.com"]
+    assert OutgoingEmail.objects.get().sent_at is not None
+
+
+@pytest.mark.django_db
+def test_failed_batch_releases_unsent_emails(settings, monkeypatch):
+    settings.EMAIL_BACKEND = "core.mail.QueuedEmailBackend"
+    settings.EMAIL_DELIVERY_BACKEND = f"{__name__}.FlakyBackend"
+    monkeypatch.setattr(FlakyBackend, "fail_at", 2)
+    send(6)
+    with pytest.raises(ConnectionError):
+        deliver_outbox()
+    assert len(mail.outbox) == 2
+    assert OutgoingEmail.objects.filter(sent_at__isnull=False).count() == 2
+    assert not OutgoingEmail.objects.filter(
+        sent_at__isnull=True, claimed_until__isnull=False
+    ).exists()
+
+    monkeypatch.setattr(FlakyBackend, "fail_at", None)
+    deliver_outbox()
+    assert sorted(message.to[0] for message in mail.outbox) == [
+        f"user{number}@example.com" for number in range(6)
+    ]
+
+    send(1)
+    claim_emails("другой воркер")
+    with pytest.raises(OutboxNotEmpty):
+        deliver_outbox()
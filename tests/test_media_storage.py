@@ -0,0 +1,106 @@
+import os
+import time
+from io import StringIO
+
+import pytest
+from core.storage import is_content_name
+from core.views import serve_media
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import RequestFactory
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def files_under(root):
+    return sorted(
+        os.path.relpath(os.path.join(folder, name), root)
+        for folder, _, names in os.walk(root) for name in names
+    )
+
+
+def age(name, seconds):
+    moment = time.time() - seconds
+    os.utime(default_storage.path(name), (moment, moment))
+
+
+def test_identical_uploads_share_one_file(mixer, user, media):
+    first = mixer.blend("blog.Post", author=user, image="")
+    second = mixer.blend("blog.Post", author=user, image="")
+    first.image.save("cat.JPG", ContentFile(b"same bytes"))
+    second.image.save("copy-of-cat.jpg", ContentFile(b"same bytes"))
+    assert first.image.name == second.image.name
+    assert is_content_name(first.image.name)
+    assert first.image.name.endswith(".jpg")
+    assert files_under(media) == [first.image.name]
+
+    other = default_storage.save("posts/dog.jpg", ContentFile(b"other"))
+    assert other != first.image.name
+    assert not is_content_name("posts/cat.jpg")
+
+
+def test_content_addressed_media_is_immutable(media):
+    hashed = default_storage.save("posts/a.png", ContentFile(b"png"))
+    (media / "posts" / "legacy.png").write_bytes(b"png")
+    request = RequestFactory().get("/")
+    response = serve_media(request, hashed, document_root=str(media))
+    assert "immutable" in response["Cache-Control"]
+    response = serve_media(
+        request, "posts/legacy.png", document_root=str(media)
+    )
+    assert "Cache-Control" not in response
+
+
+def test_gc_media_removes_only_old_orphans(mixer, user, media):
+    post = mixer.blend("blog.Post", author=user, image="")
+    post.image.save("kept.jpg", ContentFile(b"kept"))
+    variant = default_storage.save(
+        "posts/variants/kept_320.webp", ContentFile(b"variant")
+    )
+    post.image_variants = {"name": post.image.name, "files": [[320, variant]]}
+    post.save()
+    orphan = default_storage.save("posts/gone.jpg", ContentFile(b"gone"))
+    fresh = default_storage.save("posts/fresh.jpg", ContentFile(b"fresh"))
+    for name in (post.image.name, variant, orphan):
+        age(name, 2 * 3600)
+
+    out = StringIO()
+    call_command("gc_media", dry_run=True, stdout=out)
+    assert orphan in out.getvalue()
+    assert default_storage.exists(orphan)
+
+    call_command("gc_media", stdout=StringIO())
+    assert files_under(media) == sorted([post.image.name, variant, fresh])
+
+    post.delete()
+    call_command("gc_media", min_age=0, stdout=StringIO())
+    assert files_under(media) == []
+
+
+def test_gc_media_streams_references_in_name_order(mixer, user, media):
+    kept = []
+    for i in range(5):
+        post = mixer.blend("blog.Post", author=user, image="")
+        post.image.save(f"{i}.jpg", ContentFile(f"kept {i}".encode()))
+        kept.append(post.image.name)
+    # Старые имена без хеша лежат рядом с папками хешей: posts/ab.jpg
+    # сравнивается раньше posts/ab/….
+    legacy = []
+    for name in kept:
+        legacy.append(f"posts/{name[6:8]}.jpg")
+        (media / legacy[-1]).write_bytes(b"old")
+    mixer.blend("blog.Post", author=user, image=legacy[0])
+    orphans = legacy[1:]
+    for name in kept + legacy:
+        age(name, 2 * 3600)
+
+    call_command("gc_media", chunk_size=1, stdout=StringIO())
+    assert files_under(media) == sorted(kept + legacy[:1])
+    assert not any(default_storage.exists(name) for name in orphans)
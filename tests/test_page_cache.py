@@ -0,0 +1,126 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_with_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, {"page": 1})
+    return response, len(queries)
+
+
+@pytest.fixture
+def pages(user):
+    return ["/", f"/profile/{user.username}/"]
+
+
+@pytest.fixture(params=["locmem", "filebased"])
+def cache_backend(request, settings, tmp_path):
+    if request.param == "filebased":
+        settings.CACHES = {
+            "default": {
+                "BACKEND": (
+                    "django.core.cache.backends.filebased.FileBasedCache"
+                ),
+                "LOCATION": str(tmp_path),
+            }
+        }
+    return request.param
+
+
+def test_anonymous_pages_are_cached(
+        client, cache_backend, pages, post_with_published_location
+):
+    for url in pages:
+        first, first_queries = get_with_queries(client, url)
+        second, second_queries = get_with_queries(client, url)
+        assert first_queries > 0
+        assert second_queries == 0, url
+        assert first.content == second.content
+
+
+def test_authenticated_pages_are_not_cached(
+        user_client, pages, post_with_published_location
+):
+    for url in pages:
+        get_with_queries(user_client, url)
+        _, queries = get_with_queries(user_client, url)
+        assert queries > 0, url
+
+
+def test_comment_invalidates_cached_pages(
+        client, mixer, user, pages, post_with_published_location
+):
+    for url in pages:
+        get_with_queries(client, url)
+    mixer.blend(
+        "blog.Comment", post=post_with_published_location, author=user
+    )
+    for url in pages:
+        response, queries = get_with_queries(client, url)
+        assert queries > 0, url
+        assert "Комментарии (1)" in response.content.decode()
+
+
+def test_post_card_fragment_is_shared_and_versioned(
+        user_client, user, mixer, post_with_published_location
+):
+    from django.core.cache import cache
+    from django.core.cache.utils import make_template_fragment_key
+
+    post = post_with_published_location
+
+    def card_key():
+        post.refresh_from_db()
+        return make_template_fragment_key(
+            "post_card", [post.id, post.card_version]
+        )
+
+    user_client.get("/")
+    key = card_key()
+    assert cache.get(key) is not None
+    assert cache.get(key) in user_client.get(
+        f"/profile/{user.username}/"
+    ).content.decode()
+
+    mixer.blend("blog.Comment", post=post, author=user)
+    assert card_key() != key
+
+    key = card_key()
+    user.username = user.username + "_renamed"
+    user.save()
+    assert card_key() != key
+
+
+def test_category_page_requires_login_and_is_not_cached(
+        client, user_client, post_with_published_location
+):
+    url = f"/category/{post_with_published_location.category.slug}/"
+    response = client.get(url)
+    assert response.status_code == 302
+    assert response["Location"].startswith("/auth/login/")
+    get_with_queries(user_client, url)
+    _, queries = get_with_queries(user_client, url)
+    assert queries > 0
+
+
+def test_username_change_invalidates_cached_pages(
+        client, user, pages, post_with_published_location
+):
+    for url in pages:
+        get_with_queries(client, url)
+    user.last_login = user.date_joined
+    user.save(update_fields=["last_login"])
+    for url in pages:
+        _, queries = get_with_queries(client, url)
+        assert queries == 0, url
+
+    old_username = user.username
+    user.username = old_username + "_renamed"
+    user.save()
+    response, queries = get_with_queries(client, "/")
+    assert queries > 0
+    assert f"@{user.username}" in response.content.decode()
+    assert f"@{old_username}<" not in response.content.decode()
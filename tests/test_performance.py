@@ -0,0 +1,86 @@
+import json
+import re
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def timing_log(settings, caplog):
+    settings.PERF_SAMPLE_RATE = 1
+    caplog.set_level("INFO", logger="core.performance")
+
+    def records():
+        return [
+            json.loads(record.getMessage()) for record in caplog.records
+            if record.name == "core.performance"
+        ]
+
+    return records
+
+
+def test_sampled_request_reports_server_timing(
+    client, mixer, settings, timing_log
+):
+    settings.PERF_SERVER_TIMING = "all"
+    mixer.cycle(3).blend(
+        "blog.Post", is_published=True, category__is_published=True
+    )
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/")
+    assert response.status_code == 200
+    header = response["Server-Timing"]
+    assert f'db;desc="SQL ({len(queries)})"' in header
+    for metric in ("db", "tpl", "total"):
+        assert re.search(rf"\b{metric};(desc=\"[^\"]*\";)?dur=[\d.]+", header)
+    [line] = timing_log()
+    assert line["view"] == "blog:index"
+    assert line["status"] == 200
+    assert line["db_queries"] == len(queries)
+    assert line["template_ms"] > 0
+    assert line["total_ms"] >= line["template_ms"]
+    assert line["cache_misses"] >= 1
+
+    cached = client.get("/")
+    assert cached.status_code == 200
+    second = timing_log()[-1]
+    assert second["cache_hits"] >= 1
+    assert second["db_queries"] < line["db_queries"]
+
+
+def test_unsampled_request_is_not_instrumented(client, settings, timing_log):
+    settings.PERF_SAMPLE_RATE = 0
+    response = client.get("/")
+    assert "Server-Timing" not in response
+    assert timing_log() == []
+    assert connection.execute_wrappers == []
+
+
+def test_server_timing_is_shown_to_staff_only(
+    client, admin_client, timing_log
+):
+    response = client.get("/")
+    assert response.status_code == 200
+    assert "Server-Timing" not in response, (
+        "Анонимному посетителю не отдаётся Server-Timing."
+    )
+    [line] = timing_log()
+    assert line["view"] == "blog:index", (
+        "Строка журнала пишется и без заголовка."
+    )
+    response = admin_client.get("/")
+    assert "Server-Timing" in response
+
+
+def test_bench_perf_reports_all_profiles():
+    stdout = StringIO()
+    call_command("bench_perf", requests=2, rounds=1, stdout=stdout)
+    lines = stdout.getvalue().splitlines()
+    assert [line.split()[0] for line in lines[1:]] == [
+        "off", "sampled", "always"
+    ]
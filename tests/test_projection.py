@@ -0,0 +1,61 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Model
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+SKIPPED_COLUMNS = (
+    '"blog_post"."text"',
+    '"auth_user"."password"',
+    '"blog_category"."description"',
+)
+
+
+@pytest.fixture
+def pages(mixer, user):
+    category = mixer.blend("blog.Category", is_published=True)
+    location = mixer.blend("blog.Location", is_published=True)
+    mixer.cycle(3).blend(
+        "blog.Post", author=user, category=category, location=location,
+        title="Проекция колонок", is_published=True,
+    )
+    cache.clear()
+    return [
+        "/",
+        f"/profile/{user.username}/",
+        f"/category/{category.slug}/",
+        "/search/?q=Проекция",
+    ]
+
+
+@pytest.fixture
+def no_deferred_loads(monkeypatch):
+    """Чтение отложенного поля — лишний запрос на строку: падаем."""
+    refresh_from_db = Model.refresh_from_db
+
+    def guarded(self, using=None, fields=None):
+        if fields is not None:
+            pytest.fail(
+                f"Шаблон прочитал отложенное поле {type(self).__name__}."
+                f"{', '.join(fields)}"
+            )
+        return refresh_from_db(self, using=using, fields=fields)
+
+    monkeypatch.setattr(Model, "refresh_from_db", guarded)
+
+
+def test_list_pages_load_only_card_columns(
+    user_client, pages, no_deferred_loads
+):
+    for url in pages:
+        with CaptureQueriesContext(connection) as queries:
+            response = user_client.get(url)
+        assert response.status_code == 200, url
+        assert len(response.context["page_obj"]) == 3, url
+        for query in queries.captured_queries:
+            if 'FROM "blog_post"' not in query["sql"]:
+                continue
+            for column in SKIPPED_COLUMNS:
+                assert column not in query["sql"], (url, query["sql"])
@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+
+import pytest
+from blog.models import Post, PostQuerySet, floor_publication_time
+from django.test import override_settings
+
+pytestmark = [pytest.mark.django_db]
+
+MOMENT = datetime(2024, 5, 1, 12, 30, 41, 123456, tzinfo=dt_timezone.utc)
+
+
+@override_settings(BLOG_PUBLICATION_CLOCK_GRANULARITY=60)
+def test_feed_sql_is_stable_within_interval():
+    queries = []
+    for seconds in (0, 5, 18):
+        with mock.patch(
+            "django.utils.timezone.now",
+            return_value=MOMENT + timedelta(seconds=seconds),
+        ):
+            queries.append(
+                str(PostQuerySet.add_filter(None, Post.objects).query)
+            )
+    assert len(set(queries)) == 1
+
+
+@override_settings(BLOG_PUBLICATION_CLOCK_GRANULARITY=0)
+def test_zero_granularity_keeps_exact_time():
+    assert floor_publication_time(MOMENT) == MOMENT
+
+
+@override_settings(BLOG_PUBLICATION_CLOCK_GRANULARITY=60)
+def test_next_publication_at(mixer, user, published_category):
+    assert PostQuerySet.next_publication_at(Post.objects) is None
+    with mock.patch("django.utils.timezone.now", return_value=MOMENT):
+        for minutes in (5, 90):
+            mixer.blend(
+                "blog.Post",
+                author=user,
+                category=published_category,
+                is_published=True,
+                pub_date=MOMENT + timedelta(minutes=minutes, seconds=7),
+            )
+        next_at = PostQuerySet.next_publication_at(Post.objects)
+    assert next_at == datetime(2024, 5, 1, 12, 36, tzinfo=dt_timezone.utc)
@@ -0,0 +1,93 @@
+from typing import List
+
+import pytest
+from blog.models import Comment, Post, PostQuerySet
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite", reason="EXPLAIN QUERY PLAN — SQLite"
+    ),
+]
+
+SCANNED_TABLES = ("blog_post", "blog_comment")
+
+
+def explain(queryset) -> List[str]:
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def assert_uses_index(queryset, shape: str):
+    plan = explain(queryset)
+    for step in plan:
+        assert not any(
+            step == f"SCAN {table}" for table in SCANNED_TABLES
+        ), f"Запрос «{shape}» читает таблицу целиком: {plan}"
+        assert "TEMP B-TREE FOR ORDER BY" not in step, (
+            f"Запрос «{shape}» сортирует без индекса: {plan}"
+        )
+
+
+@pytest.mark.parametrize("ordering", [("-pub_date",), ("-pub_date", "-id")])
+def test_feed_uses_index(ordering):
+    assert_uses_index(
+        PostQuerySet.add_filter(None, Post.objects).order_by(*ordering)[:10],
+        "лента",
+    )
+
+
+@pytest.mark.parametrize("ordering", [("-pub_date",), ("-pub_date", "-id")])
+def test_author_profile_uses_index(user, another_user, ordering):
+    for viewer_id in (None, user.id, another_user.id):
+        assert_uses_index(
+            PostQuerySet.add_filter(viewer_id, user.posts)
+            .order_by(*ordering)[:10],
+            "профиль автора",
+        )
+
+
+@pytest.mark.parametrize("ordering", [("-pub_date",), ("-pub_date", "-id")])
+def test_category_uses_index(published_category, ordering):
+    assert_uses_index(
+        PostQuerySet.add_filter(None, published_category.posts)
+        .order_by(*ordering)[:10],
+        "категория",
+    )
+
+
+def test_post_comments_use_index(post_with_published_location):
+    assert_uses_index(
+        Comment.objects.filter(post=post_with_published_location)
+        .select_related("author")
+        .order_by("created_at"),
+        "комментарии поста",
+    )
+
+
+def test_next_publication_uses_index(future_posts):
+    with CaptureQueriesContext(connection) as queries:
+        PostQuerySet.next_publication_at(Post.objects)
+    (query,) = queries.captured_queries
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN QUERY PLAN " + query["sql"])
+        plan = [row[-1] for row in cursor.fetchall()]
+    assert "SCAN blog_post" not in plan, plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+
+def test_search_reads_only_ranked_posts(user, published_category, mixer):
+    mixer.cycle(3).blend(
+        "blog.Post", title="Поиск по индексу", category=published_category
+    )
+    queryset = PostQuerySet.search(
+        PostQuerySet.add_filter(user.id, Post.objects), "поиск"
+    )
+    plan = explain(queryset[:10])
+    assert "SEARCH blog_post USING INTEGER PRIMARY KEY (rowid=?)" in plan, (
+        f"Посты должны читаться по id найденных: {plan}"
+    )
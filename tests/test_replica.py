@@ -0,0 +1,66 @@
+import sqlite3
+
+import pytest
+from blog.management.commands.sync_replica import copy_database
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+
+def test_copy_database_snapshots_primary(tmp_path):
+    primary = sqlite3.connect(tmp_path / "primary.sqlite3")
+    primary.execute("CREATE TABLE post (id INTEGER PRIMARY KEY, title TEXT)")
+    primary.executemany(
+        "INSERT INTO post (title) VALUES (?)", [("x",)] * 500
+    )
+    primary.commit()
+    target = tmp_path / "replica.sqlite3"
+    copy_database(primary, target, pages=2)
+    replica = sqlite3.connect(target)
+    assert replica.execute("SELECT count(*) FROM post").fetchone() == (500,)
+    primary.execute("INSERT INTO post (title) VALUES ('y')")
+    primary.commit()
+    assert replica.execute("SELECT count(*) FROM post").fetchone() == (500,)
+    replica.close()
+    copy_database(primary, target)
+    replica = sqlite3.connect(target)
+    assert replica.execute("SELECT count(*) FROM post").fetchone() == (501,)
+
+
+@pytest.fixture
+def replica_enabled(settings):
+    settings.BLOG_READ_REPLICA = "replica"
+
+
+@pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+def test_read_views_use_replica_until_author_writes(
+    replica_enabled, settings, mixer, user, user_client
+):
+    post = mixer.blend("blog.Post", is_published=True,
+                       category__is_published=True, author=user)
+    detail_url = reverse("blog:post_detail", args=(post.id,))
+    with CaptureQueriesContext(connections["replica"]) as replica_queries:
+        assert user_client.get(reverse("blog:index")).status_code == 200
+        assert user_client.get(detail_url).status_code == 200
+    assert replica_queries.captured_queries
+    assert not any(
+        "django_session" in query["sql"]
+        for query in replica_queries.captured_queries
+    ), "Сессия должна читаться из основной базы."
+
+    response = user_client.post(
+        reverse("blog:add_comment", args=(post.id,)), {"text": "Новый"}
+    )
+    assert response.status_code == 302
+    assert settings.BLOG_REPLICA_PIN_COOKIE in response.cookies
+    with CaptureQueriesContext(connections["replica"]) as replica_queries:
+        assert user_client.get(detail_url).status_code == 200
+    assert not replica_queries.captured_queries
+
+
+@pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+def test_write_views_and_admin_read_primary(replica_enabled, admin_client):
+    with CaptureQueriesContext(connections["replica"]) as replica_queries:
+        assert admin_client.get(reverse("blog:create_post")).status_code == 200
+        assert admin_client.get("/admin/blog/post/").status_code == 200
+    assert not replica_queries.captured_queries
@@ -0,0 +1,128 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from blog.models import Post, PostQuerySet
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def make_post(mixer, user, published_category):
+    def make(title, text="Текст", is_published=True):
+        return mixer.blend(
+            "blog.Post", title=title, text=text, author=user,
+            category=published_category, is_published=is_published,
+            pub_date=timezone.now() - timedelta(days=1),
+        )
+    return make
+
+
+def found(text, user_id=None):
+    return list(
+        PostQuerySet.search(
+            PostQuerySet.add_filter(user_id, Post.objects), text
+        ).values_list("title", flat=True)
+    )
+
+
+def test_title_match_ranks_first(make_post):
+    make_post("Про погоду", text="Сегодня снова дождь и дождь")
+    make_post("Дождь в городе")
+    assert found("дождь") == ["Дождь в городе", "Про погоду"]
+
+
+def test_words_are_prefixes_and_all_required(make_post):
+    make_post("Котики и собаки")
+    make_post("Только котики")
+    assert found("кот соба") == ["Котики и собаки"]
+    assert found('"); DROP TABLE blog_post; --') == []
+    assert found("   ") == []
+
+
+def test_respects_visibility(make_post, user, another_user):
+    make_post("Черновик", is_published=False)
+    assert found("черновик") == []
+    assert found("черновик", another_user.id) == []
+    assert found("черновик", user.id) == ["Черновик"]
+
+
+def test_index_follows_edits_deletes_and_bulk_inserts(make_post, user,
+                                                      published_category):
+    post = make_post("Старый заголовок")
+    post.title = "Новый заголовок"
+    post.save()
+    assert found("старый") == []
+    assert found("новый") == ["Новый заголовок"]
+    post.delete()
+    assert found("новый") == []
+    Post.objects.bulk_create([
+        Post(title="Массовая вставка", text="Текст", author=user,
+             category=published_category,
+             pub_date=timezone.now() - timedelta(days=1))
+    ])
+    assert found("массовая") == ["Массовая вставка"]
+
+
+def test_rebuild_restores_lost_index(make_post):
+    make_post("Восстановление индекса")
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO blog_post_fts (blog_post_fts) VALUES ('delete-all')"
+        )
+    assert found("восстановление") == []
+    call_command("rebuild_search_index", stdout=StringIO())
+    assert found("восстановление") == ["Восстановление индекса"]
+
+
+def test_search_page_paginates_with_query(client, make_post):
+    for number in range(12):
+        make_post(f"Заметка {number}")
+    response = client.get(reverse("blog:search"), {"q": "заметка"})
+    assert response.status_code == 200
+    assert len(response.context["page_obj"]) == 10
+    assert "?q=%D0%B7%D0%B0%D0%BC%D0%B5%D1%82%D0%BA%D0%B0&page=2" in (
+        response.content.decode()
+    )
+
+
+def test_search_page_title_is_plain_text(client):
+    response = client.get(reverse("blog:search"), {"q": "abc"})
+    content = response.content.decode()
+    title = content[content.index("<title>"):content.index("</title>")]
+    assert "<script" not in title
+    assert "Поиск: abc" in title
+    assert content.count("getElementById('autocomplete')") == 1, (
+        "Скрипт подсказок подключается один раз."
+    )
+
+
+def test_hidden_matches_do_not_crowd_out_visible_ones(
+        make_post, user, published_category
+):
+    make_post("Обычный пост", text="Упоминание кометы в тексте")
+
+    def bulk(count, title, **fields):
+        Post.objects.bulk_create([
+            Post(title=title, text="Текст", author=user,
+                 category=published_category,
+                 pub_date=timezone.now() - timedelta(days=1), **fields)
+            for _ in range(count)
+        ])
+
+    bulk(250, "Комета в черновике", is_published=False)
+    bulk(10, "Комета в удалённом", is_deleted=True)
+    assert found("комет") == ["Обычный пост"]
+
+    bulk(240, "Комета на виду")
+    results = PostQuerySet.search(
+        PostQuerySet.add_filter(None, Post.objects), "комет"
+    )
+    assert results.count() == 241
+    assert list(results[240:].values_list("title", flat=True)) == [
+        "Обычный пост"
+    ]
@@ -0,0 +1,41 @@
+import sqlite3
+from io import StringIO
+
+import pytest
+from core.db import apply_pragmas
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+
+
+@pytest.mark.django_db
+def test_connection_gets_pragmas():
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA busy_timeout")
+        assert cursor.fetchone()[0] == settings.SQLITE_PRAGMAS["busy_timeout"]
+        cursor.execute("PRAGMA synchronous")
+        assert cursor.fetchone()[0] == 1, "Ожидался synchronous=NORMAL."
+
+
+def test_file_database_switches_to_wal(tmp_path):
+    database = sqlite3.connect(tmp_path / "db.sqlite3")
+    apply_pragmas(database.cursor(), settings.SQLITE_PRAGMAS)
+    assert database.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    database.close()
+
+
+def test_unknown_pragma_is_rejected():
+    database = sqlite3.connect(":memory:")
+    with pytest.raises(ValueError):
+        apply_pragmas(database.cursor(), {"writable_schema": "ON"})
+    with pytest.raises(ValueError):
+        apply_pragmas(database.cursor(), {"cache_size": "1; DROP TABLE x"})
+
+
+def test_bench_sqlite_reports_both_profiles():
+    stdout = StringIO()
+    call_command(
+        "bench_sqlite", readers=1, writers=1, duration=0.2, stdout=stdout
+    )
+    lines = stdout.getvalue().splitlines()
+    assert [line.split()[0] for line in lines[1:]] == ["default", "tuned"]